@@ -0,0 +1,69 @@
+"""
+Compare the Google News parser backends on the saved HTML fixtures.
+
+Checks that every installed backend returns exactly the same article dicts as
+the reference 'html.parser' backend, then times each one.
+
+Usage:
+    python benchmarks/news_parsers.py [--repeat 20] [--fixtures benchmarks/fixtures/news]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.news_parser import PARSER_BACKENDS, available_backends
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'news')
+
+
+def parse_quietly(parser, html):
+    # Fixtures contain deliberately broken results; keep their error messages out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parser(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark news result parser backends')
+    parser.add_argument('--repeat', type=int, default=20, help='Parses per backend and fixture (default: 20)')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='Directory of saved result pages')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    missing = [name for name in PARSER_BACKENDS if name not in backends]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+    mismatches = 0
+    for path in sorted(glob.glob(os.path.join(args.fixtures, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        reference = json.dumps(parse_quietly(PARSER_BACKENDS['html.parser'], html), ensure_ascii=False)
+        print(f"\n{os.path.basename(path)} ({len(html) / 1024:.0f} KB, {len(json.loads(reference))} articles)")
+        print(f"{'backend':<12} {'ms/page':>9} {'speedup':>8}  identical")
+
+        baseline = None
+        for name in backends:
+            backend = PARSER_BACKENDS[name]
+            identical = json.dumps(parse_quietly(backend, html), ensure_ascii=False) == reference
+            mismatches += not identical
+            seconds = min(timeit.repeat(lambda: parse_quietly(backend, html), number=args.repeat, repeat=3)) / args.repeat
+            baseline = baseline or seconds
+            print(f"{name:<12} {seconds * 1000:>9.2f} {baseline / seconds:>7.1f}x  {'yes' if identical else 'NO'}")
+
+    if mismatches:
+        print(f"\n{mismatches} backend/fixture combinations differ from html.parser")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
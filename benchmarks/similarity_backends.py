@@ -0,0 +1,187 @@
+"""
+Compatibility check and benchmark for the similarity backends.
+
+Scores a deterministic corpus of company names and websites with the
+'fuzzywuzzy' reference backend and with 'rapidfuzz', reports how far the
+RapidFuzz scores drift, and exits non-zero if any score is outside tolerance
+or any legitimacy level differs.
+Then times per-pair scoring, one query against many candidates, and an
+N x M matrix.
+
+Usage:
+    python benchmarks/similarity_backends.py [--queries 300] [--candidates 20] [--matrix 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import warnings
+
+warnings.filterwarnings('ignore', message='Using slow pure-python SequenceMatcher')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import calculate_business_legitimacy
+try:
+    import Levenshtein  # noqa: F401  (fuzzywuzzy's fast path, pinned in requirements.txt)
+    LEVENSHTEIN_AVAILABLE = True
+except ImportError:
+    LEVENSHTEIN_AVAILABLE = False
+
+from utils.similarity import (
+    SIMILARITY_BACKENDS, get_matcher, extract_domain_name, name_similarity_matrix, set_backend
+)
+
+
+NAME_WORDS = [
+    'al', 'emirates', 'dubai', 'gulf', 'national', 'international', 'general', 'trading', 'contracting',
+    'properties', 'real', 'estate', 'holding', 'group', 'logistics', 'shipping', 'technical', 'services',
+    'food', 'stuff', 'electronics', 'auto', 'spare', 'parts', 'jewellery', 'perfumes', 'textiles',
+    'futtaim', 'ghurair', 'majid', 'noon', 'emaar', 'nakheel', 'arabian', 'star', 'crescent', 'falcon',
+    'llc', 'l.l.c', 'fze', 'fzc', 'fz', 'co.', 'ltd', '&', 'mgmt', 'company', 'limited'
+]
+SUFFIXES = ['.com', '.ae', '.com.ae', '.net', '.co', '.org']
+COMPANY_NAMES = ['Emaar Properties PJSC', 'noon AD Holdings', 'ABC Trading LLC', 'Al Futtaim Group',
+                 'Majid Al Futtaim Retail', 'Emirates NBD Bank', 'Dubai Duty Free', 'Nakheel Properties']
+
+# Largest allowed |rapidfuzz - fuzzywuzzy| per score. The backends are meant to
+# agree exactly; the margin only absorbs floating-point rounding
+TOLERANCES = {
+    'name_similarity': 0.02,
+    'domain_similarity': 0.5,
+    'total_score': 0.5
+}
+
+
+def build_corpus(queries, candidates, seed):
+    rng = random.Random(seed)
+
+    def name():
+        return ' '.join(rng.choice(NAME_WORDS) for _ in range(rng.randint(1, 5))).title()
+
+    def website(company):
+        words = [word for word in company.lower().replace('.', '').replace('&', '').split() if word]
+        host = ''.join(rng.sample(words, k=min(len(words), rng.randint(1, 2)))) or 'example'
+        return f"https://www.{host}{rng.choice(SUFFIXES)}/"
+
+    query_names = COMPANY_NAMES + [name() for _ in range(queries - len(COMPANY_NAMES))]
+    corpus = []
+    for query in query_names:
+        results = []
+        for _ in range(candidates):
+            # Mix near matches (variants of the query) with unrelated businesses
+            candidate = query if rng.random() < 0.3 else name()
+            if rng.random() < 0.5:
+                candidate = f"{candidate} {rng.choice(['LLC', 'Branch', 'FZE', 'Dubai', 'Head Office'])}"
+            results.append({
+                'name': candidate,
+                'website': website(candidate if rng.random() < 0.7 else query),
+                'formatted_phone_number': '04 000 0000' if rng.random() < 0.8 else None,
+                'formatted_address': 'Dubai, United Arab Emirates',
+                'geometry': {'location': {'lat': 25.2, 'lng': 55.27}},
+                'business_status': 'OPERATIONAL',
+                'rating': round(rng.uniform(2.5, 5.0), 1),
+                'user_ratings_total': rng.randint(0, 400)
+            })
+        corpus.append((query, results))
+    return corpus
+
+
+def score_corpus(corpus):
+    scores = {'name_similarity': [], 'domain_similarity': [], 'total_score': [], 'legitimacy_level': []}
+    for query, results in corpus:
+        matcher = get_matcher(query)
+        for result in results:
+            scores['name_similarity'].append(matcher.name_similarity(result['name']))
+            scores['domain_similarity'].append(matcher.domain_similarity(extract_domain_name(result['website'])))
+            legitimacy = calculate_business_legitimacy(result, query)
+            scores['total_score'].append(legitimacy['total_score'])
+            scores['legitimacy_level'].append(legitimacy['legitimacy_level'])
+    return scores
+
+
+def time_backend(corpus, matrix_queries):
+    timings = {}
+
+    start = time.perf_counter()
+    for query, results in corpus:
+        matcher = get_matcher(query)
+        for result in results:
+            matcher.name_similarity(result['name'])
+    timings['name, per pair'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query, results in corpus:
+        get_matcher(query).name_similarities([result['name'] for result in results])
+    timings['name, per query'] = time.perf_counter() - start
+
+    queries = [query for query, _ in corpus[:matrix_queries]]
+    candidates = [result['name'] for _, results in corpus for result in results]
+    start = time.perf_counter()
+    name_similarity_matrix(queries, candidates)
+    timings[f'name, {len(queries)}x{len(candidates)} matrix'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query, results in corpus:
+        matcher = get_matcher(query)
+        for result in results:
+            matcher.domain_similarity(extract_domain_name(result['website']))
+    timings['domain, per pair'] = time.perf_counter() - start
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare similarity backends')
+    parser.add_argument('--queries', type=int, default=300, help='Number of searched company names (default: 300)')
+    parser.add_argument('--candidates', type=int, default=20, help='Candidates per company (default: 20)')
+    parser.add_argument('--matrix', type=int, default=50, help='Queries in the timed N x M matrix, scored against every candidate (default: 50)')
+    parser.add_argument('--seed', type=int, default=2024, help='Corpus random seed')
+    args = parser.parse_args()
+
+    if not LEVENSHTEIN_AVAILABLE:
+        print("python-Levenshtein is not installed: fuzzywuzzy falls back to difflib, "
+              "so the reference scores differ from a full install\n")
+
+    corpus = build_corpus(max(args.queries, len(COMPANY_NAMES)), args.candidates, args.seed)
+    pairs = sum(len(results) for _, results in corpus)
+
+    try:
+        set_backend('rapidfuzz')
+    except ImportError as e:
+        print(e)
+        sys.exit(1)
+
+    set_backend('fuzzywuzzy')
+    reference = score_corpus(corpus)
+    set_backend('rapidfuzz')
+    candidate = score_corpus(corpus)
+
+    print(f"Compatibility over {pairs} pairs (rapidfuzz vs fuzzywuzzy)")
+    print(f"{'score':<18} {'max diff':>9} {'p99 diff':>9} {'mean diff':>10} {'tolerance':>10}")
+    failed = False
+    for score, tolerance in TOLERANCES.items():
+        diffs = sorted(abs(a - b) for a, b in zip(reference[score], candidate[score]))
+        failed |= diffs[-1] > tolerance
+        p99 = diffs[int(len(diffs) * 0.99)]
+        print(f"{score:<18} {diffs[-1]:>9.3f} {p99:>9.3f} {sum(diffs) / len(diffs):>10.4f} {tolerance:>10}")
+    agreement = sum(a == b for a, b in zip(reference['legitimacy_level'], candidate['legitimacy_level'])) / pairs
+    failed |= agreement < 1
+    print(f"legitimacy level agreement: {agreement:.1%}")
+
+    print(f"\n{'timing':<28}" + ''.join(f"{name:>12}" for name in SIMILARITY_BACKENDS))
+    timings = {}
+    for name in SIMILARITY_BACKENDS:
+        set_backend(name)
+        timings[name] = time_backend(corpus, args.matrix)
+    for label in timings['fuzzywuzzy']:
+        print(f"{label:<28}" + ''.join(f"{timings[name][label] * 1000:>10.1f}ms" for name in SIMILARITY_BACKENDS))
+
+    if failed:
+        print("\nrapidfuzz scores are outside tolerance or change a legitimacy level")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,4 +14,198 @@ DEFAULT_LOCATION = {
 }
 
 
-DEFAULT_RADIUS = 50000 
\ No newline at end of file
+DEFAULT_RADIUS = 50000 
+
+# Number of companies processed concurrently in batch mode
+MAX_WORKERS = 4
+
+
+# Maximum number of in-flight requests per backend, independent of MAX_WORKERS
+BACKEND_CONCURRENCY = {
+    'places': 4,
+    'geocoder': 1,
+    'news': 1
+}
+
+
+# On-disk response cache for Google Places (SQLite, one file per cache directory)
+CACHE_DIR = '.cache'
+
+
+# Time-to-live per cached endpoint, in seconds
+CACHE_TTLS = {
+    'places_search': 7 * 24 * 3600,
+    'place_details': 30 * 24 * 3600,
+    'reverse_geocode': 90 * 24 * 3600
+}
+
+
+# Maximum number of cached responses before least-recently-used entries are evicted
+CACHE_MAX_ENTRIES = 100000
+
+
+# Cache hits update an entry's last-access time in memory; the times are written to the
+# database with the next stored response, or once this many hits have accumulated
+CACHE_ACCESS_FLUSH_EVERY = 500
+
+
+# Place details and emirate validations kept in memory during a run to share between
+# companies; least-recently-used entries are dropped beyond this (the response cache
+# still covers repeats that come much later)
+PLACE_STORE_MAX_ENTRIES = 5000
+
+
+# Nominatim usage policy allows at most one request per second
+GEOCODER_RATE_LIMIT = 1.0
+
+
+# Decimal places coordinates are rounded to before reverse geocoding (3 ~ 110 m grid)
+GEOCODE_PRECISION = 3
+
+
+# Bundled emirate boundaries used to resolve emirates offline
+EMIRATE_BOUNDARIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'uae_emirates.geojson')
+
+
+# Points closer than this to an emirate boundary are resolved with Nominatim instead
+EMIRATE_BORDER_MARGIN_KM = 2.0
+
+
+# Number of saved records handed to the process pool at a time by `main.py rescore`
+RESCORE_CHUNK_SIZE = 5000
+
+
+# fsync JSON Lines output after this many records (0 only flushes, never fsyncs)
+JSONL_FSYNC_EVERY = 100
+
+
+# fsync the checkpoint journal after this many events
+CHECKPOINT_FSYNC_EVERY = 20
+
+
+
+# Place Details field profiles. Fewer fields mean a smaller response and a cheaper billing SKU.
+#   scoring: only what calculate_business_legitimacy and validate_emirate read
+#   summary: scoring plus everything shown in the text and CSV summaries
+#   full:    every field the scraper knows about (reviews, photos, dining flags, ...)
+SCORING_FIELDS = [
+    'name', 'place_id', 'website',
+    'formatted_address', 'formatted_phone_number',
+    'geometry/location',
+    'business_status', 'current_opening_hours',
+    'rating', 'user_ratings_total'
+]
+
+FIELD_PROFILES = {
+    'scoring': SCORING_FIELDS,
+    'summary': SCORING_FIELDS + [
+        'url', 'international_phone_number', 'address_component',
+        'price_level', 'type', 'editorial_summary',
+        'wheelchair_accessible_entrance',
+        'curbside_pickup', 'delivery',
+        'dine_in', 'takeout',
+        'reservable'
+    ],
+    'full': [
+        'name', 'place_id', 'url', 'website',
+        'formatted_address', 'adr_address', 'address_component',
+        'vicinity', 'plus_code',
+
+        'formatted_phone_number', 'international_phone_number',
+
+        'geometry', 'geometry/location', 'geometry/location/lat',
+        'geometry/location/lng', 'geometry/viewport',
+        'geometry/viewport/northeast', 'geometry/viewport/southwest',
+
+        'business_status', 'permanently_closed',
+        'opening_hours', 'current_opening_hours',
+        'secondary_opening_hours', 'utc_offset',
+
+        'rating', 'reviews', 'user_ratings_total',
+        'price_level',
+
+        'editorial_summary', 'type',
+        'photo', 'icon',
+
+        'wheelchair_accessible_entrance',
+        'curbside_pickup', 'delivery',
+        'dine_in', 'takeout',
+
+        'serves_beer', 'serves_wine',
+        'serves_breakfast', 'serves_lunch',
+        'serves_dinner', 'serves_brunch',
+        'serves_vegetarian_food',
+
+        'reservable'
+    ]
+}
+
+DEFAULT_FIELD_PROFILE = 'summary'
+
+
+# Candidate pruning before Place Details: a search result is only fetched if its name
+# similarity is at least PRUNE_NAME_THRESHOLD or it is among the PRUNE_TOP_K best matches,
+# and it lies within PRUNE_MAX_DISTANCE_KM of the search location
+PRUNE_NAME_THRESHOLD = 0.5
+PRUNE_TOP_K = 3
+PRUNE_MAX_DISTANCE_KM = 400
+
+
+# Places text search pagination. Further pages are only fetched while no result is a
+# confident match: one containing every word of the company name, or starting with the
+# same word and reaching SEARCH_STOP_SIMILARITY name similarity. Google needs a short
+# delay before a next_page_token becomes valid.
+SEARCH_MAX_PAGES = 3
+SEARCH_STOP_SIMILARITY = 0.9
+PAGE_TOKEN_DELAY = 2.0
+
+
+# Shared transport: retries with exponential backoff and full jitter, capped at RETRY_MAX_DELAY
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+# A host's circuit opens after this many consecutive retryable failures and
+# lets a trial request through again after CIRCUIT_RESET_TIMEOUT seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60.0
+
+
+# Requests per second allowed per host
+HOST_RATE_LIMITS = {
+    'maps.googleapis.com': 10.0,
+    'nominatim.openstreetmap.org': GEOCODER_RATE_LIMIT
+}
+
+
+# Adaptive pacing for scraped hosts: requests start min_interval seconds apart, the
+# interval is multiplied by PACING_BACKOFF on a 429 or block page (up to max_interval)
+# and shrinks by PACING_RECOVERY after each successful request
+HOST_PACING = {
+    'www.google.com': {'min_interval': 1.0, 'max_interval': 120.0}
+}
+PACING_BACKOFF = 2.0
+PACING_RECOVERY = 0.9
+
+
+# Async news search (--async-news): maximum concurrent requests and per-request timeout in seconds
+NEWS_ASYNC_CONCURRENCY = 8
+NEWS_REQUEST_TIMEOUT = 20.0
+
+
+# News result page parser: 'auto' picks the fastest installed backend (selectolax, lxml,
+# then BeautifulSoup with a SoupStrainer); see scrapers/news_parser.py
+NEWS_PARSER = 'auto'
+
+
+# String-matching backend for name and domain similarity: 'fuzzywuzzy' (original scores)
+# or 'rapidfuzz' (faster, same scores; see benchmarks/similarity_backends.py). rapidfuzz is an
+# optional requirement (requirements-optional.txt); selecting it without installing it is an error
+SIMILARITY_BACKEND = 'fuzzywuzzy'
+
+
+# Metrics exporter (--metrics-port / --metrics-textfile): address the HTTP endpoint binds to,
+# and how often the textfile-collector file is rewritten, in seconds
+METRICS_BIND_ADDRESS = '0.0.0.0'
+METRICS_TEXTFILE_INTERVAL = 15.0
@@ -1,11 +1,21 @@
 import argparse
 from scrapers.google_maps_scraper import GoogleMapsScraper
 from scrapers.google_search_scraper import GoogleSearchScraper
+from scrapers.async_news_scraper import AsyncGoogleSearchScraper
+from scrapers.news_parser import PARSER_BACKENDS
 import json
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Dict, List
-from difflib import SequenceMatcher
-from utils.fuzzy_logic import calculate_fuzzy_score, calculate_fuzzy_weights
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from utils.fuzzy_logic import (
+    FACTORS, calculate_fuzzy_score, calculate_fuzzy_scores, calculate_fuzzy_weights, calculate_fuzzy_weights_batch,
+    factor_matrix
+)
 from config.weights import (
     LEGITIMACY_WEIGHTS,
     DISPLAY_WEIGHTS,
@@ -13,178 +23,39 @@ from config.weights import (
     COLOR_THRESHOLDS,
     REQUIRED_FIELDS
 )
+from config.config import (
+    MAX_WORKERS, CACHE_DIR, GEOCODE_PRECISION, RESCORE_CHUNK_SIZE, JSONL_FSYNC_EVERY,
+    FIELD_PROFILES, DEFAULT_FIELD_PROFILE, DEFAULT_LOCATION,
+    PRUNE_NAME_THRESHOLD, PRUNE_TOP_K, PRUNE_MAX_DISTANCE_KM, SEARCH_MAX_PAGES, SEARCH_STOP_SIMILARITY,
+    NEWS_ASYNC_CONCURRENCY, NEWS_PARSER, SIMILARITY_BACKEND
+)
+from utils.concurrency import backend_limiter, ordered_map
+from utils.cache import ResponseCache
+from utils.emirates import EmirateResolver
+from utils.jsonl import JsonlWriter, read_json_array, read_jsonl
+from utils.output import JsonArrayWriter, CsvRowWriter, TextBlockWriter, truncate_output
+from utils.checkpoint import CheckpointJournal
+from utils.place_store import PlaceStore
+from utils.grouping import QueryGroups, group_key
+from utils.instrumentation import instrumentation
+from utils.metrics import metrics, MetricsServer, TextfileExporter, cache_samples, instrumentation_samples
+from utils.transport import ErrorResult
+from utils.similarity import (
+    ABBREVIATIONS, BUSINESS_SUFFIXES, SIMILARITY_BACKENDS, normalize_name, extract_domain_name, get_matcher,
+    set_backend as set_similarity_backend, calculate_domain_similarity, calculate_name_similarity,
+    calculate_email_similarity
+)
 import csv
-import re
-import tldextract
-from fuzzywuzzy import fuzz
-
-
-ABBREVIATIONS = {
-    "mgmt": "management",
-    "llc": "",
-    "ltd": "",
-    "co.": "company",
-    "corp": "corporation",
-    "inc": "",
-    "l.l.c":'',
-    "plc": "",
-    "gmbh": "",
-    "pty": "",
-    "pty.": "",
-    "ltd.": "",
-    "llc.": "",
-    "inc.": "",
-    "corp.": "",
-    "&": "and",
-    "fz": "free zone",
-    "fzc": "free zone company",
-}
-
-
-BUSINESS_SUFFIXES = [
-    "llc", "ltd", "inc", "plc", "gmbh", "pty", "corporation", "company",
-    "group", "holdings", "holding", "limited", "incorporated"
-]
-
-def normalize_name(name: str) -> str:
-    name = name.lower().strip()
-    name = re.sub(r'[^\w\s]', ' ', name)
-    
-    
-    name = re.sub(r'\s+', ' ', name)
-    
-    
-    words = name.split()
-    
-    
-    words = [word for word in words if word not in BUSINESS_SUFFIXES]
-    
-    
-    normalized_words = [ABBREVIATIONS.get(word, word) for word in words]
-    
-    
-    return " ".join(normalized_words).strip()
-
-def extract_domain_name(url: str) -> str:
-    try:
-        
-        extracted = tldextract.extract(url)
-        
-        
-        domain = f"{extracted.domain}.{extracted.suffix}"
-        
-        
-        domain_parts = domain.split('.')
-        if len(domain_parts) > 1:
-            main_domain = domain_parts[0]
-            
-            for suffix in BUSINESS_SUFFIXES:
-                main_domain = re.sub(f"{suffix}$", "", main_domain)
-            domain = f"{main_domain}.{domain_parts[1]}"
-        
-        return domain.lower()
-    except Exception:
-        return ""
-
-def calculate_domain_similarity(company_name: str, domain: str) -> float:
-    normalized_company = normalize_name(company_name)
-    normalized_domain = normalize_name(domain)
-    
-    
-    domain_parts = normalized_domain.split('.')
-    
-    
-    if len(domain_parts) >= 2:
-        second_level_domain = domain_parts[-2]  
-        remaining_domain = '.'.join(domain_parts[:-2])  
-    else:
-        second_level_domain = domain_parts[0]
-        remaining_domain = ""
-    
-    
-    
-    second_level_similarity = fuzz.token_set_ratio(normalized_company, second_level_domain)
-    
-    
-    full_domain_similarity = fuzz.token_set_ratio(normalized_company, normalized_domain)
-    
-    
-    second_level_partial = fuzz.partial_ratio(normalized_company, second_level_domain)
-    full_domain_partial = fuzz.partial_ratio(normalized_company, normalized_domain)
-    
-    
-    weighted_score = (
-        (second_level_similarity * 0.5) +    
-        (second_level_partial * 0.2) +       
-        (full_domain_similarity * 0.2) +     
-        (full_domain_partial * 0.1)          
-    )
-    
-    
-    if weighted_score > 0:  
-        
-        if second_level_partial > 30 or full_domain_partial > 30:
-            
-            weighted_score = max(weighted_score, 60)
-            
-            
-            if second_level_partial > 50 or full_domain_partial > 50:
-                weighted_score = min(weighted_score * 1.5, 95)  
-    
-    return weighted_score  
-
-def calculate_name_similarity(name1: str, name2: str, weight_primary: float = 0.6, weight_secondary: float = 0.4) -> float:
-
-    
-    name1, name2 = normalize_name(name1), normalize_name(name2)
-    
-    words1 = name1.split()
-    words2 = name2.split()
-
-    if not words1 or not words2:
-        return 0.0  
-
-    
-    primary1 = " ".join(words1[:2])
-    secondary1 = " ".join(words1[2:])
-    primary2 = " ".join(words2[:2])
-    secondary2 = " ".join(words2[2:])
-
-    
-    primary_sim = SequenceMatcher(None, primary1, primary2).ratio()
-    secondary_sim = SequenceMatcher(None, secondary1, secondary2).ratio()
+from collections import Counter
 
-    
-    weighted_score = (primary_sim * weight_primary) + (secondary_sim * weight_secondary)
-    return weighted_score
-
-def calculate_email_similarity(email1: str, email2: str) -> float:
-    
-    email1 = email1.lower().strip()
-    email2 = email2.lower().strip()
-    
-    
-    try:
-        local1, domain1 = email1.split('@')
-        local2, domain2 = email2.split('@')
-    except ValueError:
-        return 0.0  
-    
-    
-    local_similarity = SequenceMatcher(None, local1, local2).ratio()
-    domain_similarity = SequenceMatcher(None, domain1, domain2).ratio()
-    
-    
-    weighted_similarity = (local_similarity * 0.7) + (domain_similarity * 0.3)
-    
-    return weighted_similarity * 100  
 
-def calculate_business_legitimacy(result: Dict, input_company_name: str) -> Dict:
+def legitimacy_factors(result: Dict, input_company_name: str) -> Dict:
     
     data = {}
+    matcher = get_matcher(input_company_name)
     
     
-    data['name_similarity'] = calculate_name_similarity(input_company_name, result.get('name', ''))
+    data['name_similarity'] = matcher.name_similarity(result.get('name', ''))
     
     
     website = result.get('website', '')
@@ -192,7 +63,7 @@ def calculate_business_legitimacy(result: Dict, input_company_name: str) -> Dict
     if website and website.startswith('http'):
         domain = extract_domain_name(website)
         if domain:
-            website_similarity = calculate_domain_similarity(input_company_name, domain) / 100  
+            website_similarity = matcher.domain_similarity(domain) / 100  
     data['website_similarity'] = website_similarity
     
     
@@ -256,9 +127,9 @@ def calculate_business_legitimacy(result: Dict, input_company_name: str) -> Dict
             emirate_confidence = 0.5
     data['emirate_confidence'] = emirate_confidence
     
-    
-    weights = calculate_fuzzy_weights(data)
-    total_score, legitimacy_level = calculate_fuzzy_score(data)
+    return data
+
+def legitimacy_report(data: Dict, weights: Dict[str, float], total_score: float, legitimacy_level: str) -> Dict:
     
     return {
         'total_score': round(total_score, 2),
@@ -267,7 +138,51 @@ def calculate_business_legitimacy(result: Dict, input_company_name: str) -> Dict
         'weights': {factor: round(weight * 100, 2) for factor, weight in weights.items()}
     }
 
-def format_company_summary(result: Dict, input_company_name: str, input_emirate: str = None, plain_text: bool = False) -> str:
+@instrumentation.timed('scoring')
+def calculate_business_legitimacy(result: Dict, input_company_name: str) -> Dict:
+    
+    data = legitimacy_factors(result, input_company_name)
+    weights = calculate_fuzzy_weights(data)
+    total_score, legitimacy_level = calculate_fuzzy_score(data, weights)
+    
+    return legitimacy_report(data, weights, total_score, legitimacy_level)
+
+@instrumentation.timed('scoring')
+def calculate_business_legitimacy_batch(results: List[Dict], input_company_names: List[str]) -> List[Dict]:
+    
+    # Same reports as calculate_business_legitimacy, with the fuzzy weights and scores
+    # of all results computed in one vectorized pass
+    rows = [legitimacy_factors(result, name) for result, name in zip(results, input_company_names)]
+    matrix = factor_matrix(rows)
+    weights = calculate_fuzzy_weights_batch(matrix)
+    total_scores, levels = calculate_fuzzy_scores(matrix, weights)
+    
+    return [
+        legitimacy_report(data, {factor: float(weight) for factor, weight in zip(FACTORS, row_weights)},
+                          float(total_score), str(level))
+        for data, row_weights, total_score, level in zip(rows, weights, total_scores, levels)
+    ]
+
+class ScoredResult:
+    """A place result scored once against the searched company and shared by all renderers."""
+    
+    def __init__(self, result: Dict, input_company_name: str, input_emirate: str = None,
+                 legitimacy: Optional[Dict] = None):
+        self.result = result
+        self.input_company_name = input_company_name
+        self.input_emirate = input_emirate
+        self.legitimacy = legitimacy or calculate_business_legitimacy(result, input_company_name)
+    
+    def summary(self, plain_text: bool = False) -> str:
+        return format_company_summary(self.result, self.input_company_name, self.input_emirate,
+                                      plain_text=plain_text, legitimacy=self.legitimacy)
+    
+    def csv_row(self) -> Dict:
+        return format_for_csv(self.result, self.input_company_name, self.input_emirate, legitimacy=self.legitimacy)
+
+@instrumentation.timed('formatting')
+def format_company_summary(result: Dict, input_company_name: str, input_emirate: str = None, plain_text: bool = False,
+                           legitimacy: Optional[Dict] = None) -> str:
     
     
     GREEN = '' if plain_text else '\033[92m'
@@ -288,7 +203,8 @@ def format_company_summary(result: Dict, input_company_name: str, input_emirate:
     formatted.append(f"• Search Emirate: {input_emirate if input_emirate else 'N/A'}")
     formatted.append("")
     
-    legitimacy = calculate_business_legitimacy(result, input_company_name)
+    if legitimacy is None:
+        legitimacy = calculate_business_legitimacy(result, input_company_name)
     
     
     formatted.append("1. General Information:")
@@ -335,7 +251,7 @@ def format_company_summary(result: Dict, input_company_name: str, input_emirate:
         
         domain_name = extract_domain_name(website)
         if domain_name:
-            website_similarity = calculate_domain_similarity(input_company_name, domain_name)
+            website_similarity = legitimacy['breakdown']['website_similarity']
             similarity_percentage = round(website_similarity, 2)
             similarity_color = GREEN if website_similarity >= COLOR_THRESHOLDS['green'] * 100 else YELLOW if website_similarity >= COLOR_THRESHOLDS['yellow'] * 100 else RED
             formatted.append(f"• Website Name Match: {similarity_color}{similarity_percentage}%{RESET}")
@@ -593,9 +509,11 @@ def format_news_article(article: Dict) -> str:
     
     return "\n".join(formatted)
 
-def format_for_csv(result: Dict, input_company_name: str, input_emirate: str = None) -> Dict:
+@instrumentation.timed('formatting')
+def format_for_csv(result: Dict, input_company_name: str, input_emirate: str = None, legitimacy: Optional[Dict] = None) -> Dict:
     
-    legitimacy = calculate_business_legitimacy(result, input_company_name)
+    if legitimacy is None:
+        legitimacy = calculate_business_legitimacy(result, input_company_name)
 
 
     hours = result.get('current_opening_hours', {})
@@ -681,14 +599,14 @@ def format_for_csv(result: Dict, input_company_name: str, input_emirate: str = N
     
     return csv_data
 
-def save_summary_to_csv(results: List[Dict], output_file: str = None) -> str:
+def save_summary_to_csv(results: List[ScoredResult], output_file: str = None) -> str:
 
     if not output_file:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"company_summary_{timestamp}.csv"
     
     
-    csv_data = [format_for_csv(result, result['company_name'], result['emirate']) for result in results]
+    csv_data = [scored.csv_row() for scored in results]
     
     if not csv_data:
         return ""
@@ -724,7 +642,242 @@ def save_summary_to_file(summary: str, input_company_name: str, output_file: str
         print(f"Error saving summary file: {str(e)}")
         return ""
 
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+@instrumentation.timed('prescore')
+def prescore_candidates(places: List[Dict], company_name: str, threshold: float = PRUNE_NAME_THRESHOLD,
+                        top_k: int = PRUNE_TOP_K, location: Optional[Dict] = None,
+                        max_distance_km: float = PRUNE_MAX_DISTANCE_KM) -> List[Dict]:
+    
+    # Uses only fields present in the text-search response, so no extra API calls are made
+    location = location or DEFAULT_LOCATION
+    
+    nearby = []
+    for index, place in enumerate(places):
+        coordinates = place.get('geometry', {}).get('location')
+        if coordinates and distance_km(location['lat'], location['lng'], coordinates['lat'], coordinates['lng']) > max_distance_km:
+            continue
+        nearby.append(index)
+    
+    similarities = get_matcher(company_name).name_similarities([places[index].get('name', '') for index in nearby])
+    scored = []
+    for index, similarity in zip(nearby, similarities):
+        operational = places[index].get('business_status', 'OPERATIONAL') == 'OPERATIONAL'
+        scored.append((similarity, operational, index))
+    
+    ranked = sorted(scored, key=lambda item: (-item[0], not item[1], item[2]))
+    keep = {index for rank, (similarity, _, index) in enumerate(ranked) if similarity >= threshold or rank < top_k}
+    
+    return [place for index, place in enumerate(places) if index in keep]
+
+def fetch_place(maps_scraper: GoogleMapsScraper, place: Dict, company_name: str, emirate: Optional[str],
+                row: Optional[int] = None, journal: Optional[CheckpointJournal] = None,
+                place_store: Optional[PlaceStore] = None) -> Union[Dict, ErrorResult, None]:
+    
+    place_id = place['place_id']
+    if journal:
+        details = journal.place_details(row, company_name, place_id)
+        if details:
+            return details
+    
+    if place_store:
+        details = place_store.details(place_id, lambda: maps_scraper.get_place_details(place_id))
+    else:
+        details = maps_scraper.get_place_details(place_id)
+    if not details:
+        return details
+    
+    # The payload may be shared with other companies that found the same place
+    details = dict(details)
+    details['company_name'] = company_name
+    details['emirate'] = emirate
+    if emirate:
+        if place_store:
+            validation = place_store.validation(place_id, emirate, lambda: maps_scraper.validate_emirate(details, emirate))
+        else:
+            validation = maps_scraper.validate_emirate(details, emirate)
+        if isinstance(validation, ErrorResult):
+            return validation
+        details['emirate_validation'] = validation
+    
+    if journal:
+        journal.record_place(row, company_name, place_id, details)
+    return details
+
+@instrumentation.timed('process_company')
+def process_company(row: int, company: Dict, maps_scraper: GoogleMapsScraper, google_scraper: GoogleSearchScraper,
+                    domains: Optional[List[str]], task_pool: ThreadPoolExecutor,
+                    news_pool: Optional[ThreadPoolExecutor] = None,
+                    journal: Optional[CheckpointJournal] = None, place_store: Optional[PlaceStore] = None, prune: bool = True,
+                    prune_threshold: float = PRUNE_NAME_THRESHOLD, prune_top_k: int = PRUNE_TOP_K,
+                    max_pages: int = SEARCH_MAX_PAGES, stop_similarity: float = SEARCH_STOP_SIMILARITY) -> Dict:
+    
+    company_name = company['company_name']
+    emirate = company.get('emirate')
+    
+    
+    # News requests are paced, so they run on their own pool and are collected by the caller;
+    # this worker moves on to the next company instead of waiting out the delay
+    news_future = google_scraper.submit_news(news_pool or task_pool, company_name, domains)
+    
+    matcher = get_matcher(company_name)
+    maps_results = maps_scraper.search_company(
+        company_name,
+        max_pages=max_pages,
+        is_match=lambda place: matcher.is_confident_match(place.get('name', ''), stop_similarity)
+    )
+    candidates = maps_results
+    if prune:
+        candidates = prescore_candidates(maps_results, company_name, threshold=prune_threshold, top_k=prune_top_k)
+    
+    place_futures = [
+        task_pool.submit(fetch_place, maps_scraper, place, company_name, emirate, row, journal, place_store)
+        for place in candidates
+    ]
+    places = [future.result() for future in place_futures]
+    detailed_results = [details for details in places if details]
+    
+    # Failures that may succeed later (quota, 5xx, timeouts, open circuit) must not be scored as
+    # "nothing found"; the row is left for --resume. Permanent errors such as NOT_FOUND only drop the place.
+    errors = [result.error for result in [maps_results, *places]
+              if isinstance(result, ErrorResult) and result.error.retryable]
+    
+    return {
+        'row': row,
+        'company_name': company_name,
+        'emirate': emirate,
+        'maps_results': maps_results,
+        'candidates': candidates,
+        'detailed_results': detailed_results,
+        'news_future': news_future,
+        'errors': errors
+    }
+
+def outcome_for_row(outcome: Dict, row: int, company: Dict) -> Dict:
+    
+    # Rows of the same group share one search; each keeps its own spelling of the name and emirate
+    if outcome['row'] == row:
+        return outcome
+    
+    company_name = company['company_name']
+    emirate = company.get('emirate')
+    return dict(
+        outcome,
+        row=row,
+        company_name=company_name,
+        emirate=emirate,
+        detailed_results=[dict(details, company_name=company_name, emirate=emirate)
+                          for details in outcome['detailed_results']]
+    )
+
+def pipeline_metrics(cache: Optional[ResponseCache], maps_scraper: GoogleMapsScraper, place_store: PlaceStore,
+                     query_groups: Optional[QueryGroups]) -> List[Tuple[str, Dict[str, str], float]]:
+    
+    samples = instrumentation_samples(instrumentation.snapshot())
+    
+    cache_stats = dict(cache.stats()) if cache else {}
+    cache_stats['geocode_grid'] = maps_scraper.reverse_geocoder.stats()
+    place_stats = place_store.stats()
+    cache_stats['place_store_details'] = place_stats['details']
+    cache_stats['place_store_validation'] = place_stats['validation']
+    if query_groups:
+        cache_stats['query_groups'] = query_groups.stats()
+    
+    for name, stats in cache_stats.items():
+        samples.extend(cache_samples(name, stats['hits'], stats['misses']))
+    return samples
+
+def load_place_details(paths: List[str]) -> Iterator[Dict]:
+    
+    for path in paths:
+        if path.endswith('.jsonl'):
+            yield from read_jsonl(path)
+            continue
+        
+        # JSON arrays are parsed element by element, so large exports stream like JSON Lines
+        try:
+            yield from read_json_array(path)
+        except Exception as e:
+            print(f"Error reading place details from {path}: {str(e)}")
+
+def select_similarity_backend(parser: argparse.ArgumentParser, name: str) -> None:
+    
+    # Fail before any work starts; the default comes from SIMILARITY_BACKEND and is not checked by argparse
+    try:
+        set_similarity_backend(name)
+    except (ValueError, ImportError) as e:
+        source = '--similarity' if name != SIMILARITY_BACKEND else 'SIMILARITY_BACKEND in config/config.py; choose another with --similarity'
+        parser.error(f"{e} (selected by {source})")
+
+def rescore_records(results: List[Dict]) -> List[Tuple[str, Dict]]:
+    
+    legitimacies = calculate_business_legitimacy_batch(results, [result['company_name'] for result in results])
+    rendered = []
+    for result, legitimacy in zip(results, legitimacies):
+        scored = ScoredResult(result, result['company_name'], result.get('emirate'), legitimacy=legitimacy)
+        rendered.append((scored.summary(plain_text=True), scored.csv_row()))
+    return rendered
+
+def rescore(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py rescore', description='Re-score saved place details without calling any API')
+    parser.add_argument('paths', nargs='+', help='JSON or JSON Lines files written by a previous run (--output); both are read incrementally')
+    parser.add_argument('--csv', help='Output file path for CSV summary')
+    parser.add_argument('-s', '--summary', help='Output file path for text summary')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of scoring processes (default: CPU count)')
+    parser.add_argument('--similarity', choices=list(SIMILARITY_BACKENDS), default=SIMILARITY_BACKEND, help=f'String-matching backend for name and website similarity (default: {SIMILARITY_BACKEND})')
+    args = parser.parse_args(argv)
+    select_similarity_backend(parser, args.similarity)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_output_file = args.csv or f"company_summary_rescored_{timestamp}.csv"
+    summary_file = args.summary or f"company_summary_rescored_{timestamp}.txt"
+    
+    records = (
+        record for record in load_place_details(args.paths)
+        if isinstance(record, dict) and record.get('company_name')
+    )
+    
+    csv_writer = CsvRowWriter(csv_output_file)
+    summary_writer = TextBlockWriter(summary_file)
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=set_similarity_backend,
+                                 initargs=(args.similarity,)) as pool:
+            
+            # Work through the input in bounded chunks so memory does not grow with the number of records
+            while True:
+                chunk = list(islice(records, RESCORE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                
+                # Each process scores a batch of records at once with the vectorized fuzzy scorer
+                batch_size = max(1, len(chunk) // (max(1, args.workers) * 4))
+                batches = [chunk[start:start + batch_size] for start in range(0, len(chunk), batch_size)]
+                for rendered in pool.map(rescore_records, batches):
+                    for summary, row in rendered:
+                        csv_writer.write(row)
+                        summary_writer.write(summary)
+                
+                print(f"Re-scored {csv_writer.count} records")
+    finally:
+        csv_writer.close()
+        summary_writer.close()
+    
+    if not csv_writer.count:
+        print("No place details with a company_name found to re-score.")
+        return
+    
+    print(f"All company summaries saved to: {csv_output_file}")
+    print(f"All company summaries saved to: {summary_file}")
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'rescore':
+        rescore(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description='Company Data Analyzer')
     parser.add_argument('--input', help='Input CSV file containing company names and emirates (columns: company_name,emirate)')
     parser.add_argument('company_name', nargs='?', help='Company name to search for (optional if using --input)')
@@ -733,117 +886,262 @@ def main():
     parser.add_argument('--output', help='Output file path for company data')
     parser.add_argument('--csv', help='Output file path for CSV summary')
     parser.add_argument('-s', '--summary', help='Custom output file path for text summary (optional)')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json', help='Format of the company data output (default: json)')
+    parser.add_argument('--fsync-every', type=int, default=JSONL_FSYNC_EVERY, help=f'With --format jsonl, fsync after this many records (default: {JSONL_FSYNC_EVERY})')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help=f'Number of companies processed concurrently (default: {MAX_WORKERS})')
+    parser.add_argument('--places-concurrency', type=int, help='Maximum concurrent Google Places requests')
+    parser.add_argument('--geocoder-concurrency', type=int, help='Maximum concurrent reverse-geocoding requests')
+    parser.add_argument('--news-concurrency', type=int, help='Maximum concurrent news search requests')
+    parser.add_argument('--async-news', action='store_true', help=f'Run news searches on an asyncio event loop with a pooled httpx client (requires httpx; --news-concurrency defaults to {NEWS_ASYNC_CONCURRENCY})')
+    parser.add_argument('--news-fan-out', action='store_true', help='With --async-news, send one news query per domain and merge the results')
+    parser.add_argument('--news-parser', choices=['auto', *PARSER_BACKENDS], default=NEWS_PARSER, help=f'HTML parser backend for news results (default: {NEWS_PARSER})')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help=f'Directory for the Google Places response cache (default: {CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the Google Places response cache')
+    parser.add_argument('--online-emirates', action='store_true', help='Always validate emirates with reverse geocoding instead of the bundled boundaries')
+    parser.add_argument('--fields', choices=list(FIELD_PROFILES), default=DEFAULT_FIELD_PROFILE, help=f'Place Details field profile to request (default: {DEFAULT_FIELD_PROFILE})')
+    parser.add_argument('--max-pages', type=int, default=SEARCH_MAX_PAGES, help=f'Maximum Places search result pages per company (default: {SEARCH_MAX_PAGES})')
+    parser.add_argument('--stop-similarity', type=float, default=SEARCH_STOP_SIMILARITY, help=f'Stop fetching result pages once a result contains every word of the company name, or starts with the same word and reaches this name similarity (default: {SEARCH_STOP_SIMILARITY})')
+    parser.add_argument('--prune-threshold', type=float, default=PRUNE_NAME_THRESHOLD, help=f'Minimum name similarity (0-1) for a search result to be fetched in detail (default: {PRUNE_NAME_THRESHOLD})')
+    parser.add_argument('--top-k', type=int, default=PRUNE_TOP_K, help=f'Always fetch details for the K best-matching search results (default: {PRUNE_TOP_K})')
+    parser.add_argument('--no-prune', action='store_true', help='Fetch details for every search result')
+    parser.add_argument('--no-dedup', action='store_true', help='Search every input row separately, even if another row names the same company')
+    parser.add_argument('--resume', action='store_true', help='Skip input rows completed by a previous run (see --checkpoint) and append to its output files')
+    parser.add_argument('--checkpoint', help='Checkpoint journal path (default: <input>.checkpoint.jsonl when using --input)')
+    parser.add_argument('--geocode-precision', type=int, default=GEOCODE_PRECISION, help=f'Decimal places coordinates are rounded to before reverse geocoding (default: {GEOCODE_PRECISION})')
+    parser.add_argument('--similarity', choices=list(SIMILARITY_BACKENDS), default=SIMILARITY_BACKEND, help=f'String-matching backend for name and website similarity (default: {SIMILARITY_BACKEND})')
+    parser.add_argument('--stats', action='store_true', help='Print a table of time spent in each pipeline stage at the end of the run')
+    parser.add_argument('--stats-json', help='Write stage timings, latency percentiles and counters to this JSON file at the end of the run')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port at /metrics while the run is in progress')
+    parser.add_argument('--metrics-textfile', help='Write Prometheus metrics to this file periodically, for the node_exporter textfile collector')
     args = parser.parse_args()
+    select_similarity_backend(parser, args.similarity)
 
     try:
-        maps_scraper = GoogleMapsScraper()
-        google_scraper = GoogleSearchScraper()
-
-        
-        if args.input:
-            try:
-                with open(args.input, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    companies = list(reader)
-            except Exception as e:
-                print(f"Error reading CSV file: {str(e)}")
-                return
-        else:
-            if not args.company_name:
-                print("Please provide either --input CSV file or company_name argument")
-                return
-            companies = [{'company_name': args.company_name, 'emirate': args.emirate}]
-
-        
-        all_detailed_results = []
-        all_news = []
-        all_summaries = []
-        all_summaries_txt = []
-        seen_urls = set()
+        cache = None if args.no_cache else ResponseCache(args.cache_dir)
+        emirate_resolver = None if args.online_emirates else EmirateResolver()
+        maps_scraper = GoogleMapsScraper(cache=cache, geocode_precision=args.geocode_precision, emirate_resolver=emirate_resolver,
+                                         field_profile=args.fields)
 
         
-        for company in companies:
-            company_name = company['company_name']
-            emirate = company.get('emirate')
-            
-            print(f"\nProcessing company: {company_name}")
-            if emirate:
-                print(f"Expected emirate: {emirate}")
-
+        with ExitStack() as stack:
+            if cache:
+                stack.callback(cache.close)
+            if args.async_news:
+                google_scraper = AsyncGoogleSearchScraper(max_concurrency=args.news_concurrency or NEWS_ASYNC_CONCURRENCY,
+                                                          fan_out=args.news_fan_out, parser=args.news_parser)
+                stack.callback(google_scraper.close)
+            else:
+                google_scraper = GoogleSearchScraper(parser=args.news_parser)
             
-            maps_results = maps_scraper.search_company(company_name)
-            
-            if maps_results:
-                detailed_results = []
-                for place in maps_results:
-                    print(f"Getting details for: {place.get('name', 'Unknown')}")
-                    details = maps_scraper.get_place_details(place['place_id'])
-                    details['company_name'] = company_name
-                    details['emirate'] = emirate
-                    if details:
-                        if emirate:
-                            details['emirate_validation'] = maps_scraper.validate_emirate(details, emirate)
-                        detailed_results.append(details)
-                
-                if not detailed_results:
-                    print("No detailed company information found.")
-                    continue
+            if args.input:
+                try:
+                    input_file = stack.enter_context(open(args.input, 'r', encoding='utf-8'))
+                except Exception as e:
+                    print(f"Error reading CSV file: {str(e)}")
+                    return
                 
+                def load_companies():
+                    input_file.seek(0)
+                    return csv.DictReader(input_file)
+            else:
+                if not args.company_name:
+                    print("Please provide either --input CSV file or company_name argument")
+                    return
                 
-                all_detailed_results.extend(detailed_results)
-                
-                
-                for result in detailed_results:
-                    console_summary = format_company_summary(result, company_name, emirate, plain_text=False)
-                    console_summary_txt = format_company_summary(result, company_name, emirate, plain_text=True)
-                    all_summaries.append(console_summary)
-                    all_summaries_txt.append(console_summary_txt)
-                    print(console_summary)
-                    print("-" * 50)
-
+                def load_companies():
+                    return [{'company_name': args.company_name, 'emirate': args.emirate}]
             
-            print(f"\nSearching for news and press releases: {company_name}")
-            google_news_results = google_scraper.search_news(company_name, args.domains)
             
-            if google_news_results:
-                for article in google_news_results:
-                    url = article.get('url', '')
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        all_news.append(article)
-                        print(format_news_article(article))
-                        print("-" * 50)
+            backend_overrides = {
+                'places': args.places_concurrency,
+                'geocoder': args.geocoder_concurrency,
+                'news': args.news_concurrency
+            }
+            backend_limiter.configure({backend: limit for backend, limit in backend_overrides.items() if limit})
             
-            print("\n" + "="*80 + "\n")  
-
-        
-        if all_detailed_results:
+            workers = max(1, args.workers)
+            task_workers = workers + sum(backend_limiter.limits.values())
             
-            maps_output_file = args.output or maps_scraper.save_to_json(all_detailed_results)
-            if maps_output_file:
-                print(f"\nAll company data saved to: {maps_output_file}")
             
+            journal = None
+            checkpoint_path = args.checkpoint or (f"{args.input}.checkpoint.jsonl" if args.input else None)
+            if checkpoint_path:
+                journal = CheckpointJournal(checkpoint_path, resume=args.resume)
+                stack.callback(journal.close)
+                if journal.done_rows:
+                    print(f"Resuming: skipping {len(journal.done_rows)} completed rows from {checkpoint_path}")
             
-            csv_output_file = save_summary_to_csv(all_detailed_results, args.csv)
-            if csv_output_file:
-                print(f"All company summaries saved to: {csv_output_file}")
+            def pending_rows():
+                return (
+                    (row, company) for row, company in enumerate(load_companies())
+                    if not (journal and journal.is_done(row, company['company_name']))
+                )
             
             
-            combined_summary = "\n\n".join(all_summaries_txt)
-            summary_file = save_summary_to_file(combined_summary, "all_companies", args.summary)
-            if summary_file:
-                print(f"All company summaries saved to: {summary_file}")
-
-        if all_news:
+            # Pre-pass: count the rows naming each company, so a group's shared result can be
+            # dropped after its last row while the input itself is still streamed
+            query_groups = None
+            if not args.no_dedup:
+                query_groups = QueryGroups(Counter(group_key(company) for _, company in pending_rows()))
+            
+            def process_row(item):
+                row, company = item
+                search = lambda: process_company(row, company, maps_scraper, google_scraper, args.domains, task_pool,
+                                                 news_pool, journal, place_store, prune=not args.no_prune,
+                                                 prune_threshold=args.prune_threshold, prune_top_k=args.top_k,
+                                                 max_pages=args.max_pages, stop_similarity=args.stop_similarity)
+                if not query_groups:
+                    return search()
+                return outcome_for_row(query_groups.get(group_key(company), search), row, company)
+            
+            
+            # Outputs are written as each company completes, so memory is bounded by the companies in flight
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            news_output_file = f"all_news_data_{timestamp}.json"
+            if args.format == 'jsonl':
+                data_writer = JsonlWriter(args.output or f"company_data_{timestamp}.jsonl", fsync_every=args.fsync_every)
+            else:
+                data_writer = JsonArrayWriter(args.output or f"company_data_{timestamp}.json", append=args.resume)
+            csv_writer = CsvRowWriter(args.csv or f"company_summary_{timestamp}.csv", append=args.resume)
+            summary_writer = TextBlockWriter(args.summary or f"company_summary_all_companies_{timestamp}.txt", append=args.resume)
+            news_writer = JsonArrayWriter(f"all_news_data_{timestamp}.json")
+            for writer in (data_writer, csv_writer, summary_writer, news_writer):
+                stack.callback(writer.close)
             
-            with open(news_output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_news, f, ensure_ascii=False, indent=4)
+            # Drop whatever an interrupted run wrote after its last completed row; that row is redone
+            output_writers = (data_writer, csv_writer, summary_writer)
+            if journal:
+                for writer in output_writers:
+                    if writer.path in journal.output_sizes:
+                        truncate_output(writer.path, journal.output_sizes[writer.path])
+                journal.record_outputs({writer.path: writer.size() for writer in output_writers})
+            seen_urls = set()
+            failed_companies = 0
+            news_failures = 0
+            place_store = PlaceStore()
             
-            print(f"All news data saved to: {news_output_file}")
+            if args.metrics_port is not None or args.metrics_textfile:
+                metrics.add_collector(lambda: pipeline_metrics(cache, maps_scraper, place_store, query_groups))
+                if args.metrics_port is not None:
+                    metrics_server = MetricsServer(metrics, args.metrics_port)
+                    stack.callback(metrics_server.close)
+                    print(f"Serving metrics on port {metrics_server.port} at /metrics")
+                if args.metrics_textfile:
+                    stack.callback(TextfileExporter(metrics, args.metrics_textfile).close)
+            
+            
+            company_pool = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            task_pool = stack.enter_context(ThreadPoolExecutor(max_workers=task_workers))
+            news_pool = stack.enter_context(ThreadPoolExecutor(max_workers=backend_limiter.limits.get('news', 1)))
+            outcomes = ordered_map(company_pool, process_row, pending_rows(), max_in_flight=workers * 2)
+            
+            
+            for outcome in outcomes:
+                company_name = outcome['company_name']
+                emirate = outcome['emirate']
+                
+                print(f"\nProcessing company: {company_name}")
+                if emirate:
+                    print(f"Expected emirate: {emirate}")
+                
+                google_news_results = outcome['news_future'].result()
+                errors = outcome['errors']
+                # Places data is already paid for, so a failed news search only leaves the news out
+                news_error = None
+                if isinstance(google_news_results, ErrorResult):
+                    news_error = str(google_news_results.error)
+                
+                instrumentation.count('companies')
+                if errors:
+                    # Leave the row out of the outputs and the checkpoint so a resumed run retries it
+                    failed_companies += 1
+                    instrumentation.count('companies_failed')
+                    for error in errors:
+                        print(f"Provider error: {error}")
+                    print("Skipping company; results would be incomplete.")
+                    print("\n" + "="*80 + "\n")
+                    continue
+                
+                if news_error:
+                    news_failures += 1
+                    instrumentation.count('news_failed')
+                
+                
+                maps_results = outcome['maps_results']
+                detailed_results = outcome['detailed_results']
+                for place in outcome['candidates']:
+                    print(f"Getting details for: {place.get('name', 'Unknown')}")
+                skipped = len(maps_results) - len(outcome['candidates'])
+                instrumentation.count('candidates_pruned', skipped)
+                if skipped:
+                    print(f"Skipped {skipped} unlikely candidates")
+                
+                if maps_results and not detailed_results:
+                    print("No detailed company information found.")
+                else:
+                    for result in detailed_results:
+                        scored = ScoredResult(result, company_name, emirate)
+                        metrics.inc('legitimacy_level_total', level=scored.legitimacy['legitimacy_level'])
+                        data_writer.write(dict(result, news_error=news_error) if news_error else result)
+                        csv_writer.write(scored.csv_row())
+                        summary_writer.write(scored.summary(plain_text=True))
+                        print(scored.summary(plain_text=False))
+                        print("-" * 50)
+                        instrumentation.count('records')
+                    
+                    
+                    print(f"\nSearching for news and press releases: {company_name}")
+                    
+                    if news_error:
+                        print(f"News unavailable: {news_error}")
+                    elif google_news_results:
+                        for article in google_news_results:
+                            url = article.get('url', '')
+                            if url and url not in seen_urls:
+                                seen_urls.add(url)
+                                news_writer.write(article)
+                                instrumentation.count('news_articles')
+                                print(format_news_article(article))
+                                print("-" * 50)
+                    
+                    print("\n" + "="*80 + "\n")  
+                
+                if journal:
+                    journal.record_row(outcome['row'], company_name, {writer.path: writer.size() for writer in output_writers})
+        
+        
+        if data_writer.count:
+            print(f"\nAll company data saved to: {data_writer.path}")
+            print(f"All company summaries saved to: {csv_writer.path}")
+            print(f"All company summaries saved to: {summary_writer.path}")
+        
+        if news_writer.count:
+            print(f"All news data saved to: {news_writer.path}")
         else:
             print("No news or press releases found for any company.")
+        
+        if news_failures:
+            print(f"News search failed for {news_failures} companies; their other results were saved without news.")
+        
+        if failed_companies:
+            print(f"{failed_companies} companies were skipped because of provider errors; run again with --resume to retry them.")
+        
+        if query_groups:
+            group_stats = query_groups.stats()
+            print(f"Input rows: {group_stats['hits']} reused the search of an earlier spelling, {group_stats['misses']} searched")
+        
+        place_stats = place_store.stats()
+        print(f"Place details: {place_stats['details']['hits']} shared between companies, {place_stats['details']['misses']} fetched")
+        print(f"Emirate validation: {place_stats['validation']['hits']} shared between companies, {place_stats['validation']['misses']} checked")
+        
+        geocode_stats = maps_scraper.reverse_geocoder.stats()
+        print(f"Reverse geocoding: {geocode_stats['hits']} cache hits, {geocode_stats['misses']} lookups")
+        
+        if args.stats:
+            print("\n" + instrumentation.format_table())
+        if args.stats_json:
+            with open(args.stats_json, 'w', encoding='utf-8') as f:
+                json.dump(instrumentation.snapshot(), f, indent=2)
+            print(f"Stage timings saved to: {args.stats_json}")
     
     except Exception as e:
         print(f"An error occurred: {str(e)}")
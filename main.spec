@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('data/uae_emirates.geojson', 'data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,205 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from config.config import NEWS_ASYNC_CONCURRENCY, NEWS_REQUEST_TIMEOUT, NEWS_PARSER
+from scrapers.google_search_scraper import GoogleSearchScraper, SEARCH_HOST
+from utils.instrumentation import instrumentation
+from utils.transport import Transport, TransportError, ErrorResult
+
+
+class AsyncGoogleSearchScraper(GoogleSearchScraper):
+    """
+    Google News search on an asyncio event loop with a pooled httpx client.
+    Searches for many companies run at once under a global concurrency cap;
+    requests still go through the shared transport, so Google's adaptive pacing,
+    retries and circuit breaker apply as for the blocking scraper.
+    """
+
+    def __init__(self, max_concurrency: int = NEWS_ASYNC_CONCURRENCY, transport: Optional[Transport] = None,
+                 fan_out: bool = False, http2: bool = True, timeout: float = NEWS_REQUEST_TIMEOUT,
+                 parser: str = NEWS_PARSER):
+        if httpx is None:
+            raise ImportError("Async news search requires httpx. Install it with: pip install 'httpx[http2]'")
+        super().__init__(transport, parser)
+        self.max_concurrency = max(1, max_concurrency)
+        self.fan_out = fan_out
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            print("Warning: HTTP/2 is disabled because the h2 package is missing. Install it with: pip install 'httpx[http2]'")
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_client(self) -> None:
+        # Created on first use so both live on the event loop that uses them
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _fetch_async(self, url: str) -> str:
+        """
+        Fetch a search results page. The concurrency cap is held only while the
+        request is in flight, not while the transport waits for a pacing slot.
+
+        Raises:
+            TransportError: If Google served its automated-traffic page
+        """
+        async with self._semaphore:
+            response = await self._client.get(url)
+        instrumentation.add_bytes('search_news', len(response.content))
+        response.raise_for_status()
+        self.check_blocked(response.text)
+        return response.text
+
+    @instrumentation.timed('search_news')
+    async def search_news_async(self, company_name: str,
+                                domains: Optional[List[str]] = None) -> Union[List[Dict], ErrorResult]:
+        """
+        Search for news articles about a company.
+
+        With fan_out, one query is sent per domain and the results are merged, so a
+        busy domain cannot crowd the others out of the single results page.
+
+        Args:
+            company_name (str): Name of the company to search for
+            domains (List[str], optional): List of domains to search in. Defaults to UAE news sites.
+
+        Returns:
+            Union[List[Dict], ErrorResult]: List of news articles, or ErrorResult if a search page could not be fetched
+        """
+        self._ensure_client()
+        search_domains = domains or self.default_domains
+        if self.fan_out:
+            urls = [self.build_search_url(company_name, [domain]) for domain in search_domains]
+        else:
+            urls = [self.build_search_url(company_name, search_domains)]
+
+        try:
+            pages = await asyncio.gather(*(self.transport.call_async(SEARCH_HOST, self._fetch_async, url)
+                                           for url in urls))
+
+            if len(pages) == 1:
+                return self.parse_articles(pages[0])
+
+            articles = []
+            seen_urls = set()
+            for page in pages:
+                for article in self.parse_articles(page):
+                    if article['url'] not in seen_urls:
+                        seen_urls.add(article['url'])
+                        articles.append(article)
+            return articles
+
+        except TransportError as e:
+            print(f"Error making request to Google Search: {str(e)}")
+            return ErrorResult(e)
+        except Exception as e:
+            # Like GoogleSearchScraper.search_news: a decoding or parsing failure means no articles
+            print(f"Error searching news: {str(e)}")
+            return []
+
+    async def iter_news(self, company_names: Iterable[str],
+                        domains: Optional[List[str]] = None) -> AsyncIterator[Tuple[str, Union[List[Dict], ErrorResult]]]:
+        """
+        Search news for many companies concurrently.
+
+        The input is consumed lazily, keeping at most twice the concurrency cap
+        of searches pending.
+
+        Args:
+            company_names (Iterable[str]): Companies to search for
+            domains (List[str], optional): List of domains to search in
+
+        Yields:
+            Tuple[str, Union[List[Dict], ErrorResult]]: Company name and its search result, in completion order
+        """
+        async def search(company_name):
+            try:
+                return company_name, await self.search_news_async(company_name, domains)
+            except Exception as e:
+                # One failed search must not end the iteration for every other company
+                print(f"Error searching news: {str(e)}")
+                return company_name, []
+
+        names = iter(company_names)
+        pending = set()
+        while True:
+            for company_name in names:
+                pending.add(asyncio.ensure_future(search(company_name)))
+                if len(pending) >= self.max_concurrency * 2:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='news-event-loop', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit_news(self, executor: Optional[Executor], company_name: str,
+                    domains: Optional[List[str]] = None) -> Future:
+        """
+        Start a news search on the scraper's event loop thread. The executor is not
+        used; it is accepted for compatibility with GoogleSearchScraper.
+
+        Returns:
+            Future: Resolves to the result of search_news_async
+        """
+        return asyncio.run_coroutine_threadsafe(self.search_news_async(company_name, domains), self._ensure_loop())
+
+    def search_news(self, company_name: str, domains: Optional[List[str]] = None) -> Union[List[Dict], ErrorResult]:
+        """Blocking wrapper around search_news_async for callers outside the event loop."""
+        return self.submit_news(None, company_name, domains).result()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the event loop thread, if it was started."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def __aenter__(self):
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -1,107 +1,198 @@
 import googlemaps
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Union
 import json
+import time
 from datetime import datetime
-from config.config import GOOGLE_MAPS_API_KEY, DEFAULT_LOCATION, DEFAULT_RADIUS
+from config.config import (
+    GOOGLE_MAPS_API_KEY, DEFAULT_LOCATION, DEFAULT_RADIUS, GEOCODE_PRECISION,
+    FIELD_PROFILES, DEFAULT_FIELD_PROFILE, SEARCH_MAX_PAGES, PAGE_TOKEN_DELAY
+)
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+from utils.cache import ResponseCache
+from utils.geocoding import ReverseGeocoder
+from utils.emirates import EmirateResolver
+from utils.instrumentation import instrumentation
+from utils.transport import Transport, TransportError, ErrorResult, classify_error, default_transport
 import os
 
+
+MAPS_HOST = 'maps.googleapis.com'
+
+
 class GoogleMapsScraper:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None, geocode_precision: int = GEOCODE_PRECISION,
+                 emirate_resolver: Optional[EmirateResolver] = None, field_profile: str = DEFAULT_FIELD_PROFILE,
+                 transport: Optional[Transport] = None):
         if not GOOGLE_MAPS_API_KEY:
             raise ValueError("Google Maps API key not found. Please set it in your .env file.")
-        self.gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
+        # Quota and 5xx errors are retried only by the shared transport, which honours the circuit breaker
+        self.gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY, retry_over_query_limit=False,
+                                       requests_kwargs={'hooks': {'response': [self._record_response_size,
+                                                                               self._raise_for_status]}})
+        self.transport = transport or default_transport
+        
+        self.cache = cache
+        
+        if field_profile not in FIELD_PROFILES:
+            raise ValueError(f"Unknown field profile '{field_profile}'. Choose from: {', '.join(FIELD_PROFILES)}")
+        self.detail_fields = FIELD_PROFILES[field_profile]
         
         self.geocoder = Nominatim(user_agent="company_scraper")
+        self.reverse_geocoder = ReverseGeocoder(
+            self.geocoder,
+            self.transport,
+            precision=geocode_precision,
+            cache=cache
+        )
+        
+        self.emirate_resolver = emirate_resolver
+    
+    @staticmethod
+    def _record_response_size(response, *args, **kwargs) -> None:
+        stage = 'get_place_details' if '/place/details/' in response.url else 'search_company'
+        instrumentation.add_bytes(stage, len(response.content))
     
-    def search_company(self, company_name: str, location: Optional[Dict] = None) -> List[Dict]:
+    @staticmethod
+    def _raise_for_status(response, *args, **kwargs) -> None:
+        # Raised before googlemaps.Client sees the status, so it never retries 5xx responses itself
+        if response.status_code != 200:
+            raise googlemaps.exceptions.HTTPError(response.status_code)
+    
+    def _fetch_search_page(self, company_name: str, location: Dict, page_token: Optional[str] = None) -> Dict:
+        # A fresh next_page_token is rejected with INVALID_REQUEST until Google has prepared the page
+        attempts = 3 if page_token else 1
+        for attempt in range(attempts):
+            if page_token:
+                time.sleep(PAGE_TOKEN_DELAY)
+            try:
+                return self.transport.call(
+                    MAPS_HOST,
+                    self.gmaps.places,
+                    company_name,
+                    location=location,
+                    radius=DEFAULT_RADIUS,
+                    page_token=page_token,
+                    backend='places'
+                )
+            except TransportError as e:
+                if e.status != 'INVALID_REQUEST' or attempt == attempts - 1:
+                    raise
+    
+    def iter_search_pages(self, company_name: str, location: Optional[Dict] = None,
+                          max_pages: int = SEARCH_MAX_PAGES) -> Iterator[List[Dict]]:
         """
-        Search for a company using the Google Places API.
+        Lazily iterate over result pages of a Google Places text search. The next
+        page is only requested when the consumer asks for it.
         
         Args:
             company_name (str): Name of the company to search for
             location (dict, optional): Dictionary containing lat and lng. Defaults to Dubai, UAE.
+            max_pages (int): Maximum number of pages to fetch (Google returns at most 3)
             
         Returns:
-            List[Dict]: List of matching places
+            Iterator[List[Dict]]: One list of places per page
+            
+        Raises:
+            TransportError: If a page could not be fetched
         """
         location = location or DEFAULT_LOCATION
+        page_token = None
+        token_is_live = True
         
-        try:
-            
-            places_result = self.gmaps.places(
-                company_name,
-                location=location,
-                radius=DEFAULT_RADIUS
-            )
+        for page in range(max_pages):
+            cache_key = None
+            cached = None
+            if self.cache:
+                cache_key = self.cache.make_key(company_name, location, DEFAULT_RADIUS, page)
+                cached = self.cache.get('places_search', cache_key)
+                
+            if cached is not None:
+                results, next_page_token = cached['results'], cached['next_page_token']
+                token_is_live = False
+            else:
+                if page and not token_is_live:
+                    # Page tokens expire, so a token read from the cache cannot be reused.
+                    # Walk the earlier pages again to obtain a live one.
+                    page_token = None
+                    for _ in range(page):
+                        page_token = self._fetch_search_page(company_name, location, page_token).get('next_page_token')
+                        if not page_token:
+                            return
+                    
+                places_result = self._fetch_search_page(company_name, location, page_token)
+                results = places_result.get('results', [])
+                next_page_token = places_result.get('next_page_token')
+                token_is_live = True
+                if self.cache:
+                    self.cache.set('places_search', cache_key, {'results': results, 'next_page_token': next_page_token})
+                
+            yield results
+                
+            if not next_page_token:
+                return
+            page_token = next_page_token
+    
+    @instrumentation.timed('search_company')
+    def search_company(self, company_name: str, location: Optional[Dict] = None, max_pages: int = 1,
+                       is_match: Optional[Callable[[Dict], bool]] = None) -> Union[List[Dict], ErrorResult]:
+        """
+        Search for a company using the Google Places API.
+        
+        Args:
+            company_name (str): Name of the company to search for
+            location (dict, optional): Dictionary containing lat and lng. Defaults to Dubai, UAE.
+            max_pages (int): Maximum number of result pages to fetch. Defaults to the first page only.
+            is_match (Callable, optional): Stop fetching pages once a result is surely the company
             
-            return places_result.get('results', [])
+        Returns:
+            Union[List[Dict], ErrorResult]: List of matching places, or ErrorResult if the search failed
+        """
+        results = []
+        try:
+            for page in self.iter_search_pages(company_name, location, max_pages=max_pages):
+                results.extend(page)
+                if is_match and any(is_match(place) for place in page):
+                    break
         except Exception as e:
-            print(f"Error searching for company: {str(e)}")
-            return []
+            error = classify_error(MAPS_HOST, e)
+            print(f"Error searching for company: {str(error)}")
+            if not results:
+                return ErrorResult(error)
+        return results
     
-    def get_place_details(self, place_id: str) -> Optional[Dict]:
+    @instrumentation.timed('get_place_details')
+    def get_place_details(self, place_id: str, fields: Optional[List[str]] = None) -> Union[Dict, ErrorResult, None]:
         """
         Get detailed information about a specific place.
         
         Args:
             place_id (str): Google Places ID
+            fields (List[str], optional): Fields to request. Defaults to the scraper's field profile.
             
         Returns:
-            Optional[Dict]: Detailed place information
+            Union[Dict, ErrorResult, None]: Detailed place information, or ErrorResult if the request failed
         """
+        fields = fields or self.detail_fields
+        
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(place_id, sorted(fields))
+            cached = self.cache.get('place_details', cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             
-            place_details = self.gmaps.place(
-                place_id,
-                fields=[
-                    
-                    'name', 'place_id', 'url', 'website',
-                    'formatted_address', 'adr_address', 'address_component',
-                    'vicinity', 'plus_code',
-                    
-                    
-                    'formatted_phone_number', 'international_phone_number',
-                    
-                    
-                    'geometry', 'geometry/location', 'geometry/location/lat',
-                    'geometry/location/lng', 'geometry/viewport',
-                    'geometry/viewport/northeast', 'geometry/viewport/southwest',
-                    
-                    
-                    'business_status', 'permanently_closed',
-                    'opening_hours', 'current_opening_hours',
-                    'secondary_opening_hours', 'utc_offset',
-                    
-                    
-                    'rating', 'reviews', 'user_ratings_total',
-                    'price_level',
-                    
-                    
-                    'editorial_summary', 'type',
-                    'photo', 'icon',
-                    
-                    
-                    'wheelchair_accessible_entrance',
-                    'curbside_pickup', 'delivery',
-                    'dine_in', 'takeout',
-                    
-                    
-                    'serves_beer', 'serves_wine',
-                    'serves_breakfast', 'serves_lunch',
-                    'serves_dinner', 'serves_brunch',
-                    'serves_vegetarian_food',
-                    
-                    
-                    'reservable'
-                ]
-            )
+            place_details = self.transport.call(MAPS_HOST, self.gmaps.place, place_id, fields=fields, backend='places')
             
-            return place_details.get('result')
+            result = place_details.get('result')
+            if self.cache and result:
+                self.cache.set('place_details', cache_key, result)
+            return result
         except Exception as e:
-            print(f"Error getting place details: {str(e)}")
-            return None
+            error = classify_error(MAPS_HOST, e)
+            print(f"Error getting place details: {str(error)}")
+            return ErrorResult(error)
     
     def save_to_json(self, data: Dict, filename: Optional[str] = None) -> str:
         """
@@ -145,16 +236,19 @@ class GoogleMapsScraper:
             print(f"Error saving data to file: {str(e)}")
             return ""
 
-    def validate_emirate(self, place_details: Dict, expected_emirate: str) -> Dict:
+    @instrumentation.timed('validate_emirate')
+    def validate_emirate(self, place_details: Dict, expected_emirate: str) -> Union[Dict, ErrorResult]:
         """
-        Validate if the place is located in the expected emirate using reverse geocoding.
+        Validate if the place is located in the expected emirate. The bundled emirate
+        boundaries are checked first; reverse geocoding is only used for points outside
+        them or near a border.
         
         Args:
             place_details (Dict): Place details from Google Places API
             expected_emirate (str): Expected emirate name
             
         Returns:
-            Dict: Validation result containing:
+            Union[Dict, ErrorResult]: ErrorResult if reverse geocoding failed, otherwise a validation result containing:
                 - is_valid (bool): Whether the emirate matches
                 - actual_emirate (str): The actual emirate found
                 - confidence (str): Confidence level of the validation
@@ -171,10 +265,25 @@ class GoogleMapsScraper:
         lat = place_details['geometry']['location']['lat']
         lng = place_details['geometry']['location']['lng']
         
+        if self.emirate_resolver:
+            found_emirate = self.emirate_resolver.resolve(lat, lng)
+            if found_emirate:
+                expected_emirate = expected_emirate.strip()
+                print(f"Expected Emirate: {expected_emirate}, Found Emirate: {found_emirate}")
+                return {
+                    'is_valid': found_emirate.lower() == expected_emirate.lower(),
+                    'actual_emirate': found_emirate,
+                    'confidence': 'high',
+                    'coordinates': {
+                        'latitude': lat,
+                        'longitude': lng
+                    }
+                }
+        
         try:
             
-            location = self.geocoder.reverse((lat, lng), language='en')
-            if not location or not location.raw:
+            location = self.reverse_geocoder.reverse(lat, lng)
+            if not location:
                 return {
                     'is_valid': False,
                     'actual_emirate': None,
@@ -184,7 +293,7 @@ class GoogleMapsScraper:
                 }
             
             
-            address = location.raw.get('address', {})
+            address = location['raw'].get('address', {})
             
             
             
@@ -202,7 +311,7 @@ class GoogleMapsScraper:
             
             
             if not found_emirate:
-                full_address = location.address.lower()
+                full_address = location['address'].lower()
                 emirates = {
                     'dubai': 'Dubai',
                     'abu dhabi': 'Abu Dhabi',
@@ -232,17 +341,12 @@ class GoogleMapsScraper:
                     'latitude': lat,
                     'longitude': lng
                 },
-                'full_address': location.address
+                'full_address': location['address']
             }
             
-        except (GeocoderTimedOut, GeocoderUnavailable) as e:
-            return {
-                'is_valid': False,
-                'actual_emirate': None,
-                'confidence': 'low',
-                'error': f'Geocoding error: {str(e)}',
-                'coordinates': {'latitude': lat, 'longitude': lng}
-            }
+        except TransportError as e:
+            print(f"Error reverse geocoding: {str(e)}")
+            return ErrorResult(e)
         except Exception as e:
             return {
                 'is_valid': False,
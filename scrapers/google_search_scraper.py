@@ -1,15 +1,20 @@
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Optional, Union
 import json
 from datetime import datetime, timedelta
 import requests
-from bs4 import BeautifulSoup
-import re
 from urllib.parse import quote_plus
-import time
-import random
+from config.config import NEWS_PARSER
+from scrapers.news_parser import extract_domain, get_parser
+from utils.instrumentation import instrumentation
+from utils.transport import Transport, TransportError, ErrorResult, default_transport
+
+
+SEARCH_HOST = 'www.google.com'
+
 
 class GoogleSearchScraper:
-    def __init__(self):
+    def __init__(self, transport: Optional[Transport] = None, parser: str = NEWS_PARSER):
         self.base_url = "https://www.google.com/search"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
@@ -26,6 +31,8 @@ class GoogleSearchScraper:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.transport = transport or default_transport
+        self._parse = get_parser(parser)
         
         self.default_domains = [
             "khaleejtimes.com",
@@ -35,90 +42,110 @@ class GoogleSearchScraper:
             "zawya.com"
         ]
     
-    def _random_delay(self):
-        """Add a random delay between requests to avoid rate limiting."""
-        time.sleep(random.uniform(2, 5))
-    
-    def search_news(self, company_name: str, domains: Optional[List[str]] = None) -> List[Dict]:
+    def build_search_url(self, company_name: str, domains: Optional[List[str]] = None) -> str:
         """
-        Search for news articles about a company from specific domains using Google Search.
+        Build the Google News search URL for a company, restricted to the given domains.
         
         Args:
             company_name (str): Name of the company to search for
             domains (List[str], optional): List of domains to search in. Defaults to UAE news sites.
             
         Returns:
-            List[Dict]: List of news articles
+            str: Search URL
         """
-        try:
-            
-            search_domains = domains or self.default_domains
-            
-            
-            
-            domain_query = ' OR '.join(f'site:{domain}' for domain in search_domains)
-            query = f'"{company_name}" ({domain_query})'
-            
+        search_domains = domains or self.default_domains
+        
+        
+        
+        domain_query = ' OR '.join(f'site:{domain}' for domain in search_domains)
+        query = f'"{company_name}" ({domain_query})'
+        
+        
+        encoded_query = quote_plus(query)
+        
+        
+        return f"{self.base_url}?q={encoded_query}&tbm=nws&hl=en"
+    
+    def check_blocked(self, html: str) -> None:
+        """
+        Raise if Google served its automated-traffic page instead of results.
+        
+        Raises:
+            TransportError: If the page is the automated-traffic page
+        """
+        if "Our systems have detected unusual traffic" in html:
+            raise TransportError(SEARCH_HOST, 'Google Search detected automated traffic', status='blocked',
+                                 retryable=True)
+    
+    def parse_articles(self, html: str) -> List[Dict]:
+        """
+        Extract news articles from a Google News results page with the configured parser backend.
+        
+        Args:
+            html (str): Results page HTML
             
-            encoded_query = quote_plus(query)
+        Returns:
+            List[Dict]: List of news articles
+        """
+        return self._parse(html)
+    
+    def _fetch(self, url: str) -> requests.Response:
+        """
+        Fetch a search results page. Run through the transport, whose adaptive pacer
+        spaces requests to Google and slows down when the block page is served.
+        
+        Raises:
+            TransportError: If Google served its automated-traffic page
+        """
+        response = self.session.get(url)
+        instrumentation.add_bytes('search_news', len(response.content))
+        response.raise_for_status()
+        self.check_blocked(response.text)
+        return response
+    
+    def submit_news(self, executor: Executor, company_name: str, domains: Optional[List[str]] = None) -> Future:
+        """
+        Start a news search in the background.
+        
+        Args:
+            executor (Executor): Executor to run the search on
+            company_name (str): Name of the company to search for
+            domains (List[str], optional): List of domains to search in
             
+        Returns:
+            Future: Resolves to the result of search_news
+        """
+        return executor.submit(self.search_news, company_name, domains)
+    
+    @instrumentation.timed('search_news')
+    def search_news(self, company_name: str, domains: Optional[List[str]] = None) -> Union[List[Dict], ErrorResult]:
+        """
+        Search for news articles about a company from specific domains using Google Search.
+        
+        Args:
+            company_name (str): Name of the company to search for
+            domains (List[str], optional): List of domains to search in. Defaults to UAE news sites.
             
-            url = f"{self.base_url}?q={encoded_query}&tbm=nws&hl=en"
+        Returns:
+            Union[List[Dict], ErrorResult]: List of news articles, or ErrorResult if the search page could not be fetched
+        """
+        try:
+            url = self.build_search_url(company_name, domains)
             print(url)
             
-            self._random_delay()
-            
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            
+            response = self.transport.call(SEARCH_HOST, self._fetch, url, backend='news')
+            return self.parse_articles(response.text)
             
-            if "Our systems have detected unusual traffic" in response.text:
-                print("Warning: Google Search detected automated traffic. Results may be limited.")
-                return []
-            
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = []
-            
-            
-            for result in soup.find_all('div', class_='g'):
-                try:
-                    
-                    title_elem = result.find('h3')
-                    link_elem = result.find('a')
-                    snippet_elem = result.find('div', class_='VwiC3b')
-                    source_elem = result.find('div', class_='UPmit')
-                    date_elem = result.find(text=re.compile(r'\d+ \w+ ago|\d+/\d+/\d+|\d+ hours ago|\d+ days ago'))
-                    
-                    if title_elem and link_elem:
-                        article = {
-                            'title': title_elem.get_text(),
-                            'url': link_elem['href'],
-                            'description': snippet_elem.get_text() if snippet_elem else '',
-                            'source': {
-                                'name': source_elem.get_text() if source_elem else self._extract_domain(link_elem['href'])
-                            },
-                            'publishedAt': date_elem if date_elem else ''
-                        }
-                        articles.append(article)
-                except Exception as e:
-                    print(f"Error parsing article: {str(e)}")
-                    continue
-            
-            return articles
-            
-        except requests.exceptions.RequestException as e:
+        except TransportError as e:
             print(f"Error making request to Google Search: {str(e)}")
-            return []
+            return ErrorResult(e)
         except Exception as e:
             print(f"Error searching news: {str(e)}")
             return []
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain name from URL."""
-        match = re.search(r'https?://(?:www\.)?([^/]+)', url)
-        return match.group(1) if match else ''
+        return extract_domain(url)
     
     def save_to_json(self, data: List[Dict], filename: Optional[str] = None) -> Optional[str]:
         """
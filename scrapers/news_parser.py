@@ -0,0 +1,243 @@
+"""
+Parser backends for Google News result pages.
+
+Every backend returns the same article dicts as the original BeautifulSoup
+'html.parser' implementation, which is kept as the reference:
+
+- html.parser: full BeautifulSoup parse (reference)
+- strainer:    BeautifulSoup with a SoupStrainer, so only result containers are built
+- lxml:        lxml.html with XPath selectors (optional dependency)
+- selectolax:  selectolax/lexbor with CSS selectors (optional dependency)
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+DATE_PATTERN = re.compile(r'\d+ \w+ ago|\d+/\d+/\d+|\d+ hours ago|\d+ days ago')
+
+# BeautifulSoup's get_text() leaves out comments and the strings inside these tags
+NON_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+RESULT_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' g ')]"
+SNIPPET_XPATH = "descendant::div[contains(concat(' ', normalize-space(@class), ' '), ' VwiC3b ')][1]"
+SOURCE_XPATH = "descendant::div[contains(concat(' ', normalize-space(@class), ' '), ' UPmit ')][1]"
+
+
+def extract_domain(url: str) -> str:
+    """Extract domain name from URL."""
+    match = re.search(r'https?://(?:www\.)?([^/]+)', url)
+    return match.group(1) if match else ''
+
+
+def _article(title: str, url: str, description: Optional[str], source: Optional[str], published) -> Dict:
+    return {
+        'title': title,
+        'url': url,
+        'description': description if description is not None else '',
+        'source': {
+            'name': source if source is not None else extract_domain(url)
+        },
+        'publishedAt': published if published else ''
+    }
+
+
+def _parse_soup(soup: BeautifulSoup) -> List[Dict]:
+    articles = []
+    for result in soup.find_all('div', class_='g'):
+        try:
+            title_elem = result.find('h3')
+            link_elem = result.find('a')
+            snippet_elem = result.find('div', class_='VwiC3b')
+            source_elem = result.find('div', class_='UPmit')
+            date_elem = result.find(string=DATE_PATTERN)
+
+            if title_elem and link_elem:
+                articles.append(_article(
+                    title_elem.get_text(),
+                    link_elem['href'],
+                    snippet_elem.get_text() if snippet_elem else None,
+                    source_elem.get_text() if source_elem else None,
+                    date_elem
+                ))
+        except Exception as e:
+            print(f"Error parsing article: {str(e)}")
+            continue
+
+    return articles
+
+
+def parse_html_parser(html: str) -> List[Dict]:
+    return _parse_soup(BeautifulSoup(html, 'html.parser'))
+
+
+def _is_result_class(value) -> bool:
+    # The strainer sees the raw attribute string, before it is split into class names
+    if value is None:
+        return False
+    return 'g' in (value.split() if isinstance(value, str) else value)
+
+
+RESULT_STRAINER = SoupStrainer('div', class_=_is_result_class)
+
+
+def parse_strainer(html: str) -> List[Dict]:
+    return _parse_soup(BeautifulSoup(html, 'html.parser', parse_only=RESULT_STRAINER))
+
+
+def _lxml_strings(element, text_only: bool) -> Iterator[str]:
+    """
+    Strings below an lxml element in document order. With text_only, comments and
+    strings inside NON_TEXT_TAGS are skipped, as BeautifulSoup's get_text() does.
+    """
+    if isinstance(element.tag, str):
+        if text_only and element.tag in NON_TEXT_TAGS:
+            return
+        if element.text:
+            yield element.text
+    elif not text_only and element.text:
+        # Comments and processing instructions
+        yield element.text
+
+    for child in element:
+        yield from _lxml_strings(child, text_only)
+        if child.tail:
+            yield child.tail
+
+
+def parse_lxml(html: str) -> List[Dict]:
+    try:
+        root = lxml.html.document_fromstring(html)
+    except lxml.etree.ParserError:
+        return []
+
+    articles = []
+    for result in root.xpath(RESULT_XPATH):
+        try:
+            title_elem = result.find('.//h3')
+            link_elem = result.find('.//a')
+            snippet_elem = result.xpath(SNIPPET_XPATH)
+            source_elem = result.xpath(SOURCE_XPATH)
+            date_elem = next((string for string in _lxml_strings(result, False) if DATE_PATTERN.search(string)), None)
+
+            if title_elem is not None and link_elem is not None:
+                href = link_elem.get('href')
+                if href is None:
+                    raise KeyError('href')
+                articles.append(_article(
+                    ''.join(_lxml_strings(title_elem, True)),
+                    href,
+                    ''.join(_lxml_strings(snippet_elem[0], True)) if snippet_elem else None,
+                    ''.join(_lxml_strings(source_elem[0], True)) if source_elem else None,
+                    date_elem
+                ))
+        except Exception as e:
+            print(f"Error parsing article: {str(e)}")
+            continue
+
+    return articles
+
+
+def _selectolax_strings(node, text_only: bool) -> Iterator[str]:
+    """selectolax counterpart of _lxml_strings()."""
+    child = node.child
+    while child is not None:
+        if child.is_text_node:
+            yield child.text_content
+        elif child.is_comment_node:
+            if not text_only:
+                yield child.html[4:-3]
+        elif child.is_element_node and not (text_only and child.tag in NON_TEXT_TAGS):
+            yield from _selectolax_strings(child, text_only)
+        child = child.next
+
+
+def _selectolax_first(node, selector: str):
+    # css() also matches the node itself; BeautifulSoup's find() only searches descendants
+    for match in node.css(selector):
+        if match.mem_id != node.mem_id:
+            return match
+    return None
+
+
+def parse_selectolax(html: str) -> List[Dict]:
+    tree = LexborHTMLParser(html)
+
+    articles = []
+    for result in tree.css('div.g'):
+        try:
+            title_elem = _selectolax_first(result, 'h3')
+            link_elem = _selectolax_first(result, 'a')
+            snippet_elem = _selectolax_first(result, 'div.VwiC3b')
+            source_elem = _selectolax_first(result, 'div.UPmit')
+            date_elem = next((string for string in _selectolax_strings(result, False) if DATE_PATTERN.search(string)), None)
+
+            if title_elem is not None and link_elem is not None:
+                if 'href' not in link_elem.attributes:
+                    raise KeyError('href')
+                articles.append(_article(
+                    ''.join(_selectolax_strings(title_elem, True)),
+                    link_elem.attributes['href'] or '',
+                    ''.join(_selectolax_strings(snippet_elem, True)) if snippet_elem is not None else None,
+                    ''.join(_selectolax_strings(source_elem, True)) if source_elem is not None else None,
+                    date_elem
+                ))
+        except Exception as e:
+            print(f"Error parsing article: {str(e)}")
+            continue
+
+    return articles
+
+
+PARSER_BACKENDS = {
+    'html.parser': parse_html_parser,
+    'strainer': parse_strainer,
+    'lxml': parse_lxml,
+    'selectolax': parse_selectolax
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the parser backends whose dependencies are installed."""
+    missing = set()
+    if lxml is None:
+        missing.add('lxml')
+    if LexborHTMLParser is None:
+        missing.add('selectolax')
+    return [name for name in PARSER_BACKENDS if name not in missing]
+
+
+def get_parser(name: str = 'auto') -> Callable[[str], List[Dict]]:
+    """
+    Look up a parser backend.
+
+    Args:
+        name (str): Backend name, or 'auto' for the fastest installed backend
+
+    Returns:
+        Callable[[str], List[Dict]]: Function parsing a results page into article dicts
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If the backend's dependency is not installed
+    """
+    if name == 'auto':
+        installed = available_backends()
+        name = next(backend for backend in ('selectolax', 'lxml', 'strainer') if backend in installed)
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown news parser '{name}'. Choose from: auto, {', '.join(PARSER_BACKENDS)}")
+    if name not in available_backends():
+        raise ImportError(f"The '{name}' news parser requires the {name} package: pip install {name}")
+    return PARSER_BACKENDS[name]
@@ -0,0 +1,49 @@
+import pytest
+
+from utils.emirates import EmirateResolver
+
+
+# Exclaves and border towns: the offline resolver may defer to reverse geocoding
+# (None) but must never name the wrong emirate. None as the emirate means outside the UAE.
+BORDER_POINTS = [
+    ('Masfout (Ajman exclave inside Hatta)', 24.8167, 56.0833, 'Ajman'),
+    ('Masfout town', 24.8290, 56.0750, 'Ajman'),
+    ('Hatta', 24.7963, 56.1178, 'Dubai'),
+    ('Hatta Dam', 24.8245, 56.1320, 'Dubai'),
+    ('Al Ain', 24.2075, 55.7447, 'Abu Dhabi'),
+    ('Al Ain Zoo', 24.1760, 55.7410, 'Abu Dhabi'),
+    ('Buraimi (Oman)', 24.2508, 55.7931, None),
+    ('Al Nahda, Dubai', 25.2890, 55.3720, 'Dubai'),
+    ('Al Nahda, Sharjah', 25.3030, 55.3740, 'Sharjah'),
+    ('Sahara Centre, Sharjah', 25.2975, 55.3735, 'Sharjah'),
+    ('Al Qusais, Dubai', 25.2760, 55.3800, 'Dubai'),
+    ('Manama (Ajman exclave)', 25.3330, 56.0030, 'Ajman'),
+    ('Madha (Oman)', 25.2840, 56.3320, None),
+    ('Nahwa (Sharjah)', 25.2680, 56.2830, 'Sharjah'),
+    ('Kalba (Sharjah)', 25.0570, 56.3540, 'Sharjah'),
+    ('Khor Fakkan (Sharjah)', 25.3390, 56.3560, 'Sharjah'),
+    ('Dibba Al-Hisn (Sharjah)', 25.6190, 56.2720, 'Sharjah'),
+    ('Dibba Bayah (Oman)', 25.6520, 56.2780, None),
+]
+
+CONFIDENT_POINTS = [
+    ('Masfout (Ajman exclave inside Hatta)', 24.8167, 56.0833, 'Ajman'),
+    ('Hatta Dam', 24.8245, 56.1320, 'Dubai'),
+    ('Dubai Mall', 25.1972, 55.2744, 'Dubai'),
+    ('Abu Dhabi Corniche', 24.4539, 54.3773, 'Abu Dhabi'),
+]
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return EmirateResolver()
+
+
+@pytest.mark.parametrize('place, lat, lng, emirate', BORDER_POINTS, ids=[point[0] for point in BORDER_POINTS])
+def test_border_points_never_resolve_to_the_wrong_emirate(resolver, place, lat, lng, emirate):
+    assert resolver.resolve(lat, lng) in (emirate, None)
+
+
+@pytest.mark.parametrize('place, lat, lng, emirate', CONFIDENT_POINTS, ids=[point[0] for point in CONFIDENT_POINTS])
+def test_core_points_resolve_offline(resolver, place, lat, lng, emirate):
+    assert resolver.resolve(lat, lng) == emirate
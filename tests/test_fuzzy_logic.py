@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from config.fuzzy_config import MEMBERSHIP_PARAMS, MISMATCH_THRESHOLDS
+from main import calculate_business_legitimacy, calculate_business_legitimacy_batch
+from utils.fuzzy_logic import (
+    FACTOR_DATA_KEYS, FACTORS, calculate_fuzzy_score, calculate_fuzzy_scores, calculate_fuzzy_weights,
+    calculate_fuzzy_weights_batch, factor_matrix
+)
+
+
+def factor_rows(count, seed=7):
+    rng = random.Random(seed)
+    # Values on the membership breakpoints and the mismatch threshold, where the branches switch
+    boundaries = sorted({0.0, 0.25, 0.5, 0.75, 1.0, MISMATCH_THRESHOLDS['significant_mismatch']} | {
+        value for params in MEMBERSHIP_PARAMS.values() for value in params.values()
+    })
+    rows = []
+    for _ in range(count):
+        rows.append({
+            FACTOR_DATA_KEYS[factor]: rng.choice(boundaries) if rng.random() < 0.3 else rng.random()
+            for factor in FACTORS
+        })
+    return rows
+
+
+def test_batch_scores_equal_scalar_scores():
+    rows = factor_rows(20000)
+    matrix = factor_matrix(rows)
+    weights = calculate_fuzzy_weights_batch(matrix)
+    scores, levels = calculate_fuzzy_scores(matrix, weights)
+
+    for row, row_weights, score, level in zip(rows, weights, scores, levels):
+        expected_weights = calculate_fuzzy_weights(row)
+        expected_score, expected_level = calculate_fuzzy_score(row, expected_weights)
+        assert [expected_weights[factor] for factor in FACTORS] == row_weights.tolist()
+        assert expected_score == score
+        assert expected_level == level
+
+
+def test_batch_rejects_wrong_column_count():
+    with pytest.raises(ValueError):
+        calculate_fuzzy_weights_batch([[0.5] * (len(FACTORS) - 1)])
+
+
+def test_batch_legitimacy_equals_per_result_legitimacy():
+    rng = random.Random(3)
+    results = []
+    for index in range(300):
+        results.append({
+            'name': rng.choice(['Emaar Properties', 'Emaar Malls', 'Life Pharmacy', 'ABC Trading LLC']) + f" {index % 7}",
+            'website': rng.choice(['https://www.emaar.com/', 'https://abctrading.ae/', None]),
+            'formatted_phone_number': rng.choice(['04 000 0000', None]),
+            'formatted_address': rng.choice(['Dubai, United Arab Emirates', None]),
+            'geometry': {'location': {'lat': 25.2, 'lng': 55.27}} if rng.random() < 0.8 else {},
+            'business_status': rng.choice(['OPERATIONAL', 'CLOSED_TEMPORARILY']),
+            'rating': round(rng.uniform(1, 5), 1),
+            'user_ratings_total': rng.randint(0, 300),
+            'emirate_validation': {'is_valid': rng.random() < 0.5, 'confidence': rng.choice(['high', 'low'])}
+        })
+    names = [rng.choice(['Emaar Properties', 'ABC Trading']) for _ in results]
+
+    batch = calculate_business_legitimacy_batch(results, names)
+    assert batch == [calculate_business_legitimacy(result, name) for result, name in zip(results, names)]
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('rapidfuzz')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from similarity_backends import build_corpus, score_corpus  # noqa: E402
+from utils.similarity import get_backend, get_matcher, name_similarity_matrix, set_backend  # noqa: E402
+
+
+@pytest.fixture
+def restore_backend():
+    previous = get_backend().name
+    yield
+    set_backend(previous)
+
+
+def backend_scores(corpus, name):
+    set_backend(name)
+    scores = score_corpus(corpus)
+    scores['name_similarities'] = [
+        get_matcher(query).name_similarities([result['name'] for result in results]) for query, results in corpus
+    ]
+    scores['matrix'] = name_similarity_matrix(
+        [query for query, _ in corpus[:20]], [result['name'] for _, results in corpus[:20] for result in results]
+    )
+    return scores
+
+
+@pytest.mark.parametrize('seed', [2024, 7])
+def test_rapidfuzz_scores_and_levels_equal_fuzzywuzzy(restore_backend, seed):
+    corpus = build_corpus(120, 20, seed)
+
+    reference = backend_scores(corpus, 'fuzzywuzzy')
+    candidate = backend_scores(corpus, 'rapidfuzz')
+
+    for score in ('name_similarity', 'domain_similarity', 'total_score', 'legitimacy_level',
+                  'name_similarities', 'matrix'):
+        assert candidate[score] == reference[score], score
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from utils.transport import CircuitBreaker, CircuitOpenError, Transport, classify_error
+
+THREADS = 16
+
+
+def open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    time.sleep(reset_timeout * 2)
+    assert breaker.state == 'half-open'
+    return breaker
+
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = open_breaker()
+    barrier = threading.Barrier(THREADS)
+    allowed = []
+
+    def worker():
+        barrier.wait()
+        allowed.append(breaker.allow())
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert allowed.count(True) == 1
+
+
+@pytest.mark.parametrize('outcome', ['record_success', 'record_failure', 'release_trial'])
+def test_trial_flag_clears_when_the_trial_ends(outcome):
+    breaker = open_breaker()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    getattr(breaker, outcome)()
+    if outcome == 'record_failure':
+        # A failed trial re-opens the circuit for another cool-down
+        assert not breaker.allow()
+        time.sleep(breaker.reset_timeout * 2)
+    assert breaker.allow()
+
+
+def test_transport_rejects_concurrent_calls_during_the_trial():
+    transport = Transport()
+    host = 'half-open.test'
+    transport._breakers[host] = open_breaker()
+    trial_started = threading.Event()
+    finish_trial = threading.Event()
+    results = []
+
+    def trial():
+        trial_started.set()
+        finish_trial.wait(5)
+        return 'ok'
+
+    def call(fn):
+        try:
+            results.append(transport.call(host, fn))
+        except CircuitOpenError as e:
+            results.append(e)
+
+    first = threading.Thread(target=call, args=(trial,))
+    first.start()
+    assert trial_started.wait(5)
+
+    barrier = threading.Barrier(THREADS)
+    others = [threading.Thread(target=lambda: (barrier.wait(), call(lambda: 'too early'))) for _ in range(THREADS)]
+    for thread in others:
+        thread.start()
+    for thread in others:
+        thread.join()
+    finish_trial.set()
+    first.join()
+
+    assert sum(isinstance(result, CircuitOpenError) for result in results) == THREADS
+    assert results.count('ok') == 1
+    assert transport._breakers[host].state == 'closed'
+
+
+def test_google_maps_client_leaves_5xx_retries_to_the_transport(monkeypatch):
+    requests = pytest.importorskip('requests')
+    google_maps_scraper = pytest.importorskip('scrapers.google_maps_scraper')
+    monkeypatch.setattr(google_maps_scraper, 'GOOGLE_MAPS_API_KEY', 'AIza' + 'x' * 35)
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        sent.append(request.url)
+        response = requests.Response()
+        response.status_code = 503
+        response._content = b''
+        response.url = request.url
+        response.request = request
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+    scraper = google_maps_scraper.GoogleMapsScraper()
+    with pytest.raises(Exception) as raised:
+        scraper.gmaps.places('Example Trading LLC')
+
+    error = classify_error(google_maps_scraper.MAPS_HOST, raised.value)
+    assert len(sent) == 1
+    assert error.status == 503
+    assert error.retryable
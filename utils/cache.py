@@ -0,0 +1,165 @@
+"""
+Persistent response cache backed by a single SQLite file.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config.config import CACHE_TTLS, CACHE_MAX_ENTRIES, CACHE_ACCESS_FLUSH_EVERY
+
+
+CACHE_FILENAME = 'responses.sqlite3'
+
+
+class ResponseCache:
+    """
+    Key/value cache for API responses with a TTL per endpoint and
+    size-bounded least-recently-used eviction.
+
+    Hits do not write to the database: access times are collected in memory
+    and written in one transaction with the next set(), every
+    `access_flush_every` hits, and on close().
+    """
+
+    def __init__(self, cache_dir: str, ttls: Optional[Dict[str, int]] = None,
+                 max_entries: int = CACHE_MAX_ENTRIES, access_flush_every: int = CACHE_ACCESS_FLUSH_EVERY):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.ttls = dict(CACHE_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self.access_flush_every = access_flush_every
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+        self._accessed: Dict[Tuple[str, str], float] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' endpoint TEXT NOT NULL,'
+            ' key TEXT NOT NULL,'
+            ' value TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL,'
+            ' PRIMARY KEY (endpoint, key))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a stable cache key from JSON-serialisable parts.
+
+        Args:
+            *parts: Values identifying the request (query, location, fields, ...)
+
+        Returns:
+            str: Hex digest of the serialised parts
+        """
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, endpoint: str, key: str) -> Optional[Any]:
+        """
+        Return a cached response, or None if missing or expired.
+
+        Args:
+            endpoint (str): Endpoint name, used to look up the TTL
+            key (str): Key built with make_key
+
+        Returns:
+            Optional[Any]: The decoded response
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM responses WHERE endpoint = ? AND key = ?',
+                (endpoint, key)
+            ).fetchone()
+            if row is None:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+                return None
+
+            value, created_at = row
+            ttl = self.ttls.get(endpoint)
+            if ttl is not None and now - created_at > ttl:
+                self._conn.execute('DELETE FROM responses WHERE endpoint = ? AND key = ?', (endpoint, key))
+                self._accessed.pop((endpoint, key), None)
+                self._conn.commit()
+                self._count -= 1
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+                return None
+
+            self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+
+            self._accessed[(endpoint, key)] = now
+            if len(self._accessed) >= self.access_flush_every:
+                self._write_access_times()
+                self._conn.commit()
+        return json.loads(value)
+
+    def _write_access_times(self) -> None:
+        # Caller holds the lock and commits
+        if self._accessed:
+            self._conn.executemany(
+                'UPDATE responses SET accessed_at = ? WHERE endpoint = ? AND key = ?',
+                [(accessed_at, endpoint, key) for (endpoint, key), accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def set(self, endpoint: str, key: str, value: Any) -> None:
+        """
+        Store a response, evicting the least recently used entries if the cache is full.
+
+        Args:
+            endpoint (str): Endpoint name
+            key (str): Key built with make_key
+            value (Any): JSON-serialisable response
+        """
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            # Eviction must see the recent hits
+            self._accessed.pop((endpoint, key), None)
+            self._write_access_times()
+            exists = self._conn.execute(
+                'SELECT 1 FROM responses WHERE endpoint = ? AND key = ?', (endpoint, key)
+            ).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (endpoint, key, value, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (endpoint, key, encoded, now, now)
+            )
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                excess = self._count - self.max_entries
+                self._conn.execute(
+                    'DELETE FROM responses WHERE rowid IN '
+                    '(SELECT rowid FROM responses ORDER BY accessed_at LIMIT ?)',
+                    (excess,)
+                )
+                self._count -= excess
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss counters per endpoint."""
+        with self._lock:
+            return {
+                endpoint: {'hits': self.hits.get(endpoint, 0), 'misses': self.misses.get(endpoint, 0)}
+                for endpoint in sorted(set(self.hits) | set(self.misses))
+            }
+
+    def close(self) -> None:
+        """Write pending access times and close the underlying database connection."""
+        with self._lock:
+            self._write_access_times()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,84 @@
+"""
+Checkpoint journal for resuming interrupted batch runs.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+from config.config import CHECKPOINT_FSYNC_EVERY
+from utils.jsonl import JsonlWriter, read_jsonl
+
+
+class CheckpointJournal:
+    """
+    Append-only JSON Lines journal of batch progress.
+
+    Three kinds of events are recorded:
+        - 'place': a place's details (including emirate validation) were fetched
+          for an input row, so a resumed run does not repeat the details call
+        - 'row': every output for an input row has been written; the event also
+          holds the size of each output file at that point
+        - 'outputs': the size of each output file when a run starts
+
+    A resumed run cuts the output files back to the last recorded sizes, so rows
+    written by a killed run but never marked done are not written twice.
+
+    Rows are identified by their position in the input and the company name,
+    so a journal is not applied to rows of a different input file.
+    """
+
+    def __init__(self, path: str, resume: bool = False, fsync_every: int = CHECKPOINT_FSYNC_EVERY):
+        self.path = path
+        self.done_rows = set()
+        self.output_sizes = {}
+        self._partial = {}
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            for event in read_jsonl(path):
+                self.output_sizes.update(event.get('outputs', {}))
+                row = (event.get('row'), event.get('company_name'))
+                if event.get('event') == 'row':
+                    self.done_rows.add(row)
+                    self._partial.pop(row, None)
+                elif event.get('event') == 'place' and row not in self.done_rows:
+                    self._partial.setdefault(row, {})[event['place_id']] = event['details']
+        elif os.path.exists(path):
+            os.remove(path)
+
+        self._writer = JsonlWriter(path, fsync_every=fsync_every)
+
+    def is_done(self, row: int, company_name: str) -> bool:
+        return (row, company_name) in self.done_rows
+
+    def place_details(self, row: int, company_name: str, place_id: str) -> Optional[Dict]:
+        """Return place details recorded for a partially processed row, if any."""
+        with self._lock:
+            details = self._partial.get((row, company_name), {}).get(place_id)
+        return dict(details) if details else None
+
+    def record_place(self, row: int, company_name: str, place_id: str, details: Dict) -> None:
+        self._writer.write({
+            'event': 'place',
+            'row': row,
+            'company_name': company_name,
+            'place_id': place_id,
+            'details': details
+        })
+
+    def record_outputs(self, outputs: Dict[str, int]) -> None:
+        """Record the size of each output file (path -> bytes) at the start of a run."""
+        self._writer.write({'event': 'outputs', 'outputs': outputs})
+
+    def record_row(self, row: int, company_name: str, outputs: Optional[Dict[str, int]] = None) -> None:
+        with self._lock:
+            self.done_rows.add((row, company_name))
+            self._partial.pop((row, company_name), None)
+        event = {'event': 'row', 'row': row, 'company_name': company_name}
+        if outputs is not None:
+            event['outputs'] = outputs
+        self._writer.write(event)
+
+    def close(self) -> None:
+        self._writer.close()
@@ -0,0 +1,82 @@
+"""
+Concurrency helpers for the batch pipeline.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator
+
+from config.config import BACKEND_CONCURRENCY
+
+
+class BackendLimiter:
+    """Caps the number of concurrent calls made to each backend."""
+
+    def __init__(self, limits: Dict[str, int]):
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._limits = {}
+        self.configure(limits)
+
+    @property
+    def limits(self) -> Dict[str, int]:
+        """Current concurrency cap per backend."""
+        with self._lock:
+            return dict(self._limits)
+
+    def configure(self, limits: Dict[str, int]) -> None:
+        """
+        Set the concurrency cap for one or more backends.
+
+        Args:
+            limits (Dict[str, int]): Mapping of backend name to maximum concurrent calls
+        """
+        with self._lock:
+            for backend, limit in limits.items():
+                self._limits[backend] = max(1, int(limit))
+                self._semaphores[backend] = threading.BoundedSemaphore(self._limits[backend])
+
+    @contextmanager
+    def slot(self, backend: str) -> Iterator[None]:
+        """
+        Hold one of the backend's slots for the duration of the block.
+
+        Args:
+            backend (str): Backend name (e.g. 'places', 'geocoder', 'news')
+        """
+        with self._lock:
+            semaphore = self._semaphores.get(backend)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(1)
+                self._limits[backend] = 1
+                self._semaphores[backend] = semaphore
+        with semaphore:
+            yield
+
+
+backend_limiter = BackendLimiter(BACKEND_CONCURRENCY)
+
+
+def ordered_map(executor: Executor, fn: Callable, iterable: Iterable, max_in_flight: int) -> Iterator:
+    """
+    Like executor.map, but consumes `iterable` lazily and keeps at most
+    `max_in_flight` tasks submitted at a time. Results are yielded in input order.
+
+    Args:
+        executor (Executor): Executor to submit tasks to
+        fn (Callable): Function applied to each item
+        iterable (Iterable): Input items
+        max_in_flight (int): Maximum number of submitted but not yet yielded tasks
+
+    Returns:
+        Iterator: Results of fn, in the order of the input
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
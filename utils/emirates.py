@@ -0,0 +1,124 @@
+"""
+Offline emirate resolution from bundled boundary polygons.
+"""
+
+import json
+import math
+from typing import List, Optional, Tuple
+
+from config.config import EMIRATE_BOUNDARIES_PATH, EMIRATE_BORDER_MARGIN_KM
+
+
+KM_PER_DEGREE = 111.32
+
+Ring = List[Tuple[float, float]]
+
+
+def point_in_ring(lng: float, lat: float, ring: Ring) -> bool:
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lng < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def distance_to_ring_km(lng: float, lat: float, ring: Ring) -> float:
+    # Equirectangular projection around the query point is accurate enough at this scale
+    kx = KM_PER_DEGREE * math.cos(math.radians(lat))
+    ky = KM_PER_DEGREE
+    best = float('inf')
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        ax, ay = (ring[j][0] - lng) * kx, (ring[j][1] - lat) * ky
+        bx, by = (ring[i][0] - lng) * kx, (ring[i][1] - lat) * ky
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length_sq))
+        best = min(best, math.hypot(ax + t * dx, ay + t * dy))
+        j = i
+    return best
+
+
+class EmiratePolygon:
+    """A single polygon (exterior ring plus optional holes) with its bounding box."""
+
+    def __init__(self, emirate: str, rings: List[Ring]):
+        self.emirate = emirate
+        self.exterior = rings[0]
+        self.holes = rings[1:]
+        lngs = [point[0] for point in self.exterior]
+        lats = [point[1] for point in self.exterior]
+        self.bbox = (min(lngs), min(lats), max(lngs), max(lats))
+
+    def bbox_contains(self, lng: float, lat: float, margin_deg: float) -> bool:
+        min_lng, min_lat, max_lng, max_lat = self.bbox
+        return (min_lng - margin_deg <= lng <= max_lng + margin_deg and
+                min_lat - margin_deg <= lat <= max_lat + margin_deg)
+
+    def contains(self, lng: float, lat: float) -> bool:
+        if not point_in_ring(lng, lat, self.exterior):
+            return False
+        return not any(point_in_ring(lng, lat, hole) for hole in self.holes)
+
+    def boundary_distance_km(self, lng: float, lat: float) -> float:
+        return min(distance_to_ring_km(lng, lat, ring) for ring in [self.exterior] + self.holes)
+
+
+class EmirateResolver:
+    """
+    Resolves coordinates to an emirate using the bundled GeoJSON boundaries.
+
+    A bounding-box prefilter narrows the candidates before the exact
+    point-in-polygon test. resolve() only answers when the point lies inside
+    exactly one emirate and is further than `margin_km` from every boundary;
+    otherwise it returns None and the caller should fall back to reverse geocoding.
+    """
+
+    def __init__(self, path: str = EMIRATE_BOUNDARIES_PATH, margin_km: float = EMIRATE_BORDER_MARGIN_KM):
+        self.margin_km = margin_km
+        self.polygons = []
+        with open(path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+
+        for feature in collection.get('features', []):
+            emirate = feature['properties']['name']
+            geometry = feature['geometry']
+            if geometry['type'] == 'Polygon':
+                polygons = [geometry['coordinates']]
+            elif geometry['type'] == 'MultiPolygon':
+                polygons = geometry['coordinates']
+            else:
+                continue
+            for rings in polygons:
+                self.polygons.append(EmiratePolygon(emirate, [[tuple(point[:2]) for point in ring] for ring in rings]))
+
+    def resolve(self, lat: float, lng: float) -> Optional[str]:
+        """
+        Find the emirate containing a coordinate.
+
+        Args:
+            lat (float): Latitude
+            lng (float): Longitude
+
+        Returns:
+            Optional[str]: Emirate name, or None if the point is outside every polygon or near a border
+        """
+        # Widen the bounding boxes by the margin in the larger (longitude) degree unit
+        margin_deg = self.margin_km / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+
+        found = set()
+        for polygon in self.polygons:
+            if not polygon.bbox_contains(lng, lat, margin_deg):
+                continue
+            if polygon.boundary_distance_km(lng, lat) <= self.margin_km:
+                return None
+            if polygon.contains(lng, lat):
+                found.add(polygon.emirate)
+
+        if len(found) != 1:
+            return None
+        return found.pop()
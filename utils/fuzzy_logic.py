@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from config.fuzzy_config import (
     MEMBERSHIP_PARAMS,
@@ -8,6 +8,20 @@ from config.fuzzy_config import (
     COLOR_THRESHOLDS
 )
 
+# Data key holding the raw score for each factor, in BASE_WEIGHTS order
+FACTOR_DATA_KEYS = {
+    'name_match': 'name_similarity',
+    'website_match': 'website_similarity',
+    'contact_info': 'contact_completeness',
+    'location': 'location_completeness',
+    'operational': 'operational_completeness',
+    'reviews': 'review_score',
+    'completeness': 'profile_completeness',
+    'emirate_match': 'emirate_confidence'
+}
+
+FACTORS = list(BASE_WEIGHTS)
+
 def triangular_membership(x: float, a: float, b: float, c: float) -> float:
     if x <= a:
         return 0.0
@@ -22,24 +36,7 @@ def calculate_fuzzy_weights(data: Dict) -> Dict[str, float]:
     weights = {}
     for factor, base_weight in BASE_WEIGHTS.items():
         params = MEMBERSHIP_PARAMS[factor]
-        if factor == 'name_match':
-            score = data.get('name_similarity', 0)
-        elif factor == 'website_match':
-            score = data.get('website_similarity', 0)
-        elif factor == 'contact_info':
-            score = data.get('contact_completeness', 0)
-        elif factor == 'location':
-            score = data.get('location_completeness', 0)
-        elif factor == 'operational':
-            score = data.get('operational_completeness', 0)
-        elif factor == 'reviews':
-            score = data.get('review_score', 0)
-        elif factor == 'completeness':
-            score = data.get('profile_completeness', 0)
-        elif factor == 'emirate_match':
-            score = data.get('emirate_confidence', 0)
-        else:
-            score = 0
+        score = data.get(FACTOR_DATA_KEYS.get(factor), 0)
         membership = triangular_membership(
             score,
             params['a'],
@@ -65,8 +62,9 @@ def calculate_fuzzy_weights(data: Dict) -> Dict[str, float]:
     
     return weights
 
-def calculate_fuzzy_score(data: Dict) -> Tuple[float, str]:    
-    weights = calculate_fuzzy_weights(data)
+def calculate_fuzzy_score(data: Dict, weights: Optional[Dict[str, float]] = None) -> Tuple[float, str]:    
+    if weights is None:
+        weights = calculate_fuzzy_weights(data)
     
     
     scores = {}
@@ -119,4 +117,95 @@ def calculate_fuzzy_score(data: Dict) -> Tuple[float, str]:
     else:
         level = "Very Low"
     
-    return total_score * 100, level 
\ No newline at end of file
+    return total_score * 100, level
+
+
+def factor_matrix(rows: List[Dict]) -> np.ndarray:
+    """
+    Build an N x len(FACTORS) matrix of factor scores from data dictionaries
+    as produced by calculate_business_legitimacy.
+    """
+    return np.array(
+        [[row.get(FACTOR_DATA_KEYS[factor], 0) for factor in FACTORS] for row in rows],
+        dtype=float
+    ).reshape(len(rows), len(FACTORS))
+
+def triangular_memberships(x: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.select(
+            [x <= a, x >= c, (a < x) & (x <= b)],
+            [0.0, 1.0, (x - a) / (b - a)],
+            (c - x) / (c - b)
+        )
+
+def calculate_fuzzy_weights_batch(matrix: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_fuzzy_weights.
+
+    Args:
+        matrix (np.ndarray): N x len(FACTORS) factor scores, columns in BASE_WEIGHTS order
+
+    Returns:
+        np.ndarray: N x len(FACTORS) normalized weights
+    """
+    scores = np.atleast_2d(np.asarray(matrix, dtype=float))
+    if scores.shape[1] != len(FACTORS):
+        raise ValueError(f"Expected {len(FACTORS)} factor columns, got {scores.shape[1]}")
+    
+    a = np.array([MEMBERSHIP_PARAMS[factor]['a'] for factor in FACTORS])
+    b = np.array([MEMBERSHIP_PARAMS[factor]['b'] for factor in FACTORS])
+    c = np.array([MEMBERSHIP_PARAMS[factor]['c'] for factor in FACTORS])
+    base = np.array([BASE_WEIGHTS[factor] for factor in FACTORS])
+    weights = triangular_memberships(scores, a, b, c) * base
+    
+    # Same factors the scalar path checks: data keys ending in _similarity or _completeness
+    mismatch_columns = [
+        i for i, factor in enumerate(FACTORS)
+        if FACTOR_DATA_KEYS[factor].endswith('_similarity') or FACTOR_DATA_KEYS[factor].endswith('_completeness')
+    ]
+    significant_mismatch = (scores[:, mismatch_columns] < MISMATCH_THRESHOLDS['significant_mismatch']).any(axis=1)
+    weights[significant_mismatch] *= MISMATCH_THRESHOLDS['weight_reduction']
+    
+    # Accumulate column by column so the floating point result matches sum() in the scalar path
+    total_weight = np.zeros(len(weights))
+    for i in range(len(FACTORS)):
+        total_weight += weights[:, i]
+    positive = total_weight > 0
+    weights[positive] /= total_weight[positive, None]
+    
+    return weights
+
+def calculate_fuzzy_scores(matrix: np.ndarray, weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_fuzzy_score. Produces exactly the same scores and levels
+    as the scalar path for every row.
+
+    Args:
+        matrix (np.ndarray): N x len(FACTORS) factor scores, columns in BASE_WEIGHTS order
+        weights (np.ndarray, optional): Weights from calculate_fuzzy_weights_batch
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Total scores (0-100) and legitimacy levels
+    """
+    scores = np.atleast_2d(np.asarray(matrix, dtype=float))
+    if weights is None:
+        weights = calculate_fuzzy_weights_batch(scores)
+    
+    significant_mismatch = (scores < MISMATCH_THRESHOLDS['significant_mismatch']).any(axis=1)
+    
+    total_score = np.zeros(len(scores))
+    for i in range(len(FACTORS)):
+        total_score += scores[:, i] * weights[:, i]
+    total_score[significant_mismatch] *= MISMATCH_THRESHOLDS['score_reduction']
+    
+    levels = np.select(
+        [
+            (total_score >= LEGITIMACY_THRESHOLDS['high']) & ~significant_mismatch,
+            total_score >= LEGITIMACY_THRESHOLDS['moderate'],
+            total_score >= LEGITIMACY_THRESHOLDS['low']
+        ],
+        ["High", "Moderate", "Low"],
+        "Very Low"
+    )
+    
+    return total_score * 100, levels
@@ -0,0 +1,103 @@
+"""
+Cached reverse geocoding routed through the shared transport.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from config.config import GEOCODE_PRECISION
+from utils.cache import ResponseCache
+from utils.instrumentation import instrumentation
+from utils.transport import Transport
+
+
+GEOCODER_HOST = 'nominatim.openstreetmap.org'
+
+
+class ReverseGeocoder:
+    """
+    Wraps a geopy geocoder with a coordinate-grid cache. Requests go through the
+    shared transport, which applies the host rate limit and retries.
+
+    Coordinates are rounded to `precision` decimal places, so nearby places
+    (e.g. branches in the same mall) share a single lookup.
+    """
+
+    def __init__(self, geocoder, transport: Transport, precision: int = GEOCODE_PRECISION,
+                 cache: Optional[ResponseCache] = None):
+        self.geocoder = geocoder
+        self.transport = transport
+        self.precision = precision
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _grid_key(self, lat: float, lng: float) -> Tuple[float, float]:
+        return round(lat, self.precision), round(lng, self.precision)
+
+    @instrumentation.timed('reverse_geocode')
+    def reverse(self, lat: float, lng: float) -> Optional[Dict]:
+        """
+        Reverse geocode a coordinate.
+
+        Args:
+            lat (float): Latitude
+            lng (float): Longitude
+
+        Returns:
+            Optional[Dict]: Dictionary with 'address' (str) and 'raw' (dict), or None if nothing was found
+
+        Raises:
+            TransportError: If the geocoder could not be reached; failures are not cached
+        """
+        key = self._grid_key(lat, lng)
+
+        while True:
+            with self._lock:
+                if key in self._memory:
+                    self.hits += 1
+                    return self._memory[key]
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._in_flight[key] = event
+                    break
+            # Another worker is already resolving this grid cell
+            event.wait()
+
+        try:
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.make_key(key)
+                cached = self.cache.get('reverse_geocode', cache_key)
+                if cached is not None:
+                    with self._lock:
+                        self.hits += 1
+                        self._memory[key] = cached
+                    return cached
+
+            with self._lock:
+                self.misses += 1
+            location = self.transport.call(GEOCODER_HOST, self.geocoder.reverse, key, language='en',
+                                           backend='geocoder')
+
+            result = None
+            if location and location.raw:
+                result = {'address': location.address, 'raw': location.raw}
+                if self.cache:
+                    self.cache.set('reverse_geocode', cache_key, result)
+            with self._lock:
+                self._memory[key] = result
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache hit/miss counters."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,91 @@
+"""
+Grouping of input rows that name the same company, so each group is searched once.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from utils.similarity import normalize_name
+
+
+# "L.L.C" would otherwise normalize to "l l c" rather than being dropped like "LLC"
+_DOTTED_ACRONYM = re.compile(r'\b(?:\w\.)+\w\b\.?')
+
+
+def group_key(company: Dict) -> Tuple[str, str]:
+    """
+    Canonical query for an input row: the normalized company name plus the
+    emirate, so "ABC Trading LLC" and "abc trading L.L.C" in Dubai share a key.
+    """
+    name = _DOTTED_ACRONYM.sub(lambda match: match.group(0).replace('.', ''), company.get('company_name') or '')
+    emirate = (company.get('emirate') or '').strip().lower()
+    return normalize_name(name), emirate
+
+
+class QueryGroups:
+    """
+    Results shared by the input rows of each group. The first row of a group to
+    arrive computes the result while later rows wait for it (single-flight).
+
+    `counts` gives the number of rows in each group, from a pre-pass over the
+    input. A result is dropped as soon as the last row of its group has taken
+    it, so memory stays bounded by the groups still in progress rather than by
+    the size of the input.
+    """
+
+    def __init__(self, counts: Dict[Hashable, int]):
+        self.hits = 0
+        self.misses = 0
+        self._remaining = dict(counts)
+        self._values = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _release(self, key: Hashable) -> None:
+        remaining = self._remaining.get(key, 1) - 1
+        if remaining > 0:
+            self._remaining[key] = remaining
+        else:
+            self._remaining.pop(key, None)
+            self._values.pop(key, None)
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Result for one row of the group `key`, calling `compute` only for the first row.
+
+        Raises:
+            Exception: Whatever `compute` raised; the result is not stored and the next row computes it again
+        """
+        while True:
+            with self._lock:
+                if key in self._values:
+                    self.hits += 1
+                    value = self._values[key]
+                    self._release(key)
+                    return value
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._in_flight[key] = event
+                    break
+            # Another row of this group is already being searched
+            event.wait()
+
+        try:
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            with self._lock:
+                self._values[key] = value
+                self._release(key)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return shared/searched counters."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
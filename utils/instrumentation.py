@@ -0,0 +1,209 @@
+"""
+Timing and counters for the pipeline stages.
+
+Stages are timed with `instrumentation.stage(name)` (a context manager) or the
+`instrumentation.timed(name)` decorator. Each stage keeps a call count, an
+error count, bytes received and a latency histogram. Counters record anything
+else worth counting. The histogram uses logarithmic buckets about 5% wide, so
+p50/p95/p99 are approximate but memory does not grow with the number of calls.
+"""
+
+import functools
+import inspect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.transport import ErrorResult
+
+
+# Histogram buckets: bucket i holds durations in [MIN_SECONDS * GROWTH**i, MIN_SECONDS * GROWTH**(i+1))
+MIN_SECONDS = 1e-6
+GROWTH = 1.05
+_LOG_GROWTH = math.log(GROWTH)
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with exact count, sum, min and max."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        index = int(math.log(seconds / MIN_SECONDS) / _LOG_GROWTH) if seconds > MIN_SECONDS else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile, clamped to the observed range."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(MIN_SECONDS * GROWTH ** (index + 1), self.min), self.max)
+        return self.max
+
+
+class Instrumentation:
+    """
+    Thread-safe registry of stage timings and counters. Stage times are summed
+    over threads, so with concurrent workers they can add up to more than the
+    elapsed time of the run.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> Dict:
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = {'errors': 0, 'bytes': 0, 'latency': LatencyHistogram()}
+        return stage
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one call of a stage."""
+        with self._lock:
+            stage = self._stage(name)
+            stage['latency'].add(seconds)
+            stage['errors'] += error
+
+    def add_bytes(self, name: str, size: int) -> None:
+        """Add to the bytes received by a stage."""
+        with self._lock:
+            self._stage(name)['bytes'] += size
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as one call of a stage. An exception counts as an
+        error; so does returning an ErrorResult from a function wrapped with timed().
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(name, time.perf_counter() - start, error=True)
+            raise
+        self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator timing every call of a function or coroutine function as a stage."""
+        def decorator(fn):
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        result = await fn(*args, **kwargs)
+                    except BaseException:
+                        self.record(name, time.perf_counter() - start, error=True)
+                        raise
+                    self.record(name, time.perf_counter() - start, error=isinstance(result, ErrorResult))
+                    return result
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    self.record(name, time.perf_counter() - start, error=True)
+                    raise
+                self.record(name, time.perf_counter() - start, error=isinstance(result, ErrorResult))
+                return result
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict:
+        """
+        Current numbers as plain data.
+
+        Returns:
+            Dict: 'elapsed_seconds', 'stages' (per stage: calls, errors, bytes, total/mean/min/max
+                  and p50/p95/p99 seconds, and the raw histogram buckets) and 'counters'
+        """
+        with self._lock:
+            stages = {}
+            for name, stage in self._stages.items():
+                latency = stage['latency']
+                stages[name] = {
+                    'calls': latency.count,
+                    'errors': stage['errors'],
+                    'bytes': stage['bytes'],
+                    'total_seconds': latency.total,
+                    'mean_seconds': latency.total / latency.count if latency.count else None,
+                    'min_seconds': latency.min,
+                    'max_seconds': latency.max,
+                    **{f'p{percent}_seconds': latency.percentile(percent) for percent in PERCENTILES},
+                    'histogram': {
+                        'min_seconds': MIN_SECONDS,
+                        'growth': GROWTH,
+                        'buckets': {str(index): count for index, count in sorted(latency.buckets.items())}
+                    }
+                }
+            return {
+                'elapsed_seconds': time.perf_counter() - self.started,
+                'stages': stages,
+                'counters': dict(self._counters)
+            }
+
+    def format_table(self) -> str:
+        """End-of-run table of stage timings and counters."""
+        snapshot = self.snapshot()
+
+        def ms(seconds):
+            return f"{seconds * 1000:.1f}" if seconds is not None else "-"
+
+        lines: List[str] = [
+            f"Run time: {snapshot['elapsed_seconds']:.1f}s (stage times are summed over concurrent workers)",
+            "",
+            f"{'stage':<20} {'calls':>7} {'errors':>6} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} "
+            f"{'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'KB in':>9}"
+        ]
+        stages = sorted(snapshot['stages'].items(), key=lambda item: -item[1]['total_seconds'])
+        for name, stage in stages:
+            lines.append(
+                f"{name:<20} {stage['calls']:>7} {stage['errors']:>6} {stage['total_seconds']:>9.2f} "
+                f"{ms(stage['mean_seconds']):>9} {ms(stage['p50_seconds']):>9} {ms(stage['p95_seconds']):>9} "
+                f"{ms(stage['p99_seconds']):>9} {ms(stage['max_seconds']):>9} "
+                f"{(stage['bytes'] / 1024 if stage['bytes'] else 0):>9.1f}"
+            )
+
+        if snapshot['counters']:
+            lines.append("")
+            for name, value in sorted(snapshot['counters'].items()):
+                lines.append(f"{name:<20} {value:>7}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.perf_counter()
+            self._stages.clear()
+            self._counters.clear()
+
+
+# Shared by the scrapers and main(), like the transport and backend limiter
+instrumentation = Instrumentation()
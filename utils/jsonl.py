@@ -0,0 +1,157 @@
+"""
+Append-only JSON Lines output, and streaming readers for JSON Lines and JSON array files.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator
+
+from config.config import JSONL_FSYNC_EVERY
+
+
+class JsonlWriter:
+    """
+    Appends one JSON document per line. Every record is flushed as soon as it
+    is written and the file is fsynced every `fsync_every` records, so a crash
+    loses at most the records since the last sync and never corrupts earlier lines.
+    """
+
+    def __init__(self, path: str, fsync_every: int = JSONL_FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict) -> None:
+        """
+        Append a record to the file.
+
+        Args:
+            record (Dict): JSON-serialisable record
+        """
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+            if self.fsync_every and self.count % self.fsync_every == 0:
+                os.fsync(self._file.fileno())
+
+    def size(self) -> int:
+        """Bytes of the file up to the last record, as recorded by the checkpoint journal."""
+        with self._lock:
+            return os.path.getsize(self.path)
+
+    def close(self) -> None:
+        """Flush, fsync and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """
+    Lazily read records from a JSON Lines file.
+
+    Args:
+        path (str): File to read
+
+    Returns:
+        Iterator[Dict]: Records in file order. A truncated final line, left by a
+        crash mid-write, is skipped with a warning.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping unreadable line {line_number} in {path}")
+
+
+def read_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Lazily read the elements of a JSON array file, `chunk_size` characters at a
+    time, so a large export never has to fit in memory. A file holding a single
+    JSON value instead of an array yields that value.
+
+    Args:
+        path (str): File to read
+        chunk_size (int): Characters read from the file at a time
+
+    Returns:
+        Iterator[Any]: Array elements in file order. An incomplete final element,
+        left by a run killed mid-write, is skipped with a warning.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON before its end
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while not buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer = chunk.lstrip()
+        if not buffer.startswith('['):
+            yield json.loads(buffer + f.read())
+            return
+
+        position = 1
+        expect_comma = False
+        eof = False
+        while True:
+            # Skip whitespace, reading more of the file whenever the buffer runs out
+            while True:
+                stripped = len(buffer) - len(buffer[position:].lstrip())
+                if stripped < len(buffer) or eof:
+                    position = stripped
+                    break
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+
+            if position == len(buffer):
+                print(f"Warning: {path} ends without closing its array")
+                return
+            if buffer[position] == ']':
+                return
+            if expect_comma:
+                if buffer[position] != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                position += 1
+                expect_comma = False
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # A value running to the end of the buffer (e.g. a number) may continue in the next chunk
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    print(f"Warning: Skipping incomplete last record in {path}")
+                    return
+                complete = False
+            if not complete:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+
+            yield value
+            position = end
+            expect_comma = True
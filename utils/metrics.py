@@ -0,0 +1,217 @@
+"""
+Prometheus metrics for long-running batch workers.
+
+The shared transport counts provider requests, in-flight requests and time
+spent waiting on rate limiters as they happen. Everything else (stage
+latencies, pipeline counters, cache hit ratios) is read from its source when
+the metrics are rendered, through collectors registered by main().
+
+Metrics are exposed in the Prometheus text format (version 0.0.4), either on
+an HTTP endpoint (MetricsServer) or as a file for node_exporter's textfile
+collector (TextfileExporter). No client library is needed.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from config.config import METRICS_BIND_ADDRESS, METRICS_TEXTFILE_INTERVAL
+
+
+PREFIX = 'company_scraper_'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# name (without PREFIX) -> (type, help)
+METRICS = {
+    'requests_total': ('counter', 'Provider request attempts, by provider host and status (ok, or the error status)'),
+    'circuit_open_total': ('counter', 'Provider calls refused because the host circuit breaker was open'),
+    'in_flight_requests': ('gauge', 'Provider requests currently in progress'),
+    'rate_limit_wait_seconds_total': ('counter', 'Time spent waiting for a rate limiter or pacer slot before a request'),
+    'cache_hits_total': ('counter', 'Cache lookups answered from the cache'),
+    'cache_misses_total': ('counter', 'Cache lookups that had to be fetched or computed'),
+    'cache_hit_ratio': ('gauge', 'Share of cache lookups answered from the cache'),
+    'stage_duration_seconds': ('summary', 'Time spent per call of a pipeline stage'),
+    'stage_errors_total': ('counter', 'Pipeline stage calls that failed'),
+    'stage_received_bytes_total': ('counter', 'Response bytes received by a pipeline stage'),
+    'companies_total': ('counter', 'Input companies processed'),
+    'companies_failed_total': ('counter', 'Input companies skipped because of provider errors'),
+    'records_total': ('counter', 'Place records scored and written'),
+    'records_per_second': ('gauge', 'Place records written per second, averaged over the run'),
+    'news_articles_total': ('counter', 'News articles written'),
+    'news_failed_total': ('counter', 'Companies written without news because the news search failed'),
+    'candidates_pruned_total': ('counter', 'Search results skipped before fetching place details'),
+    'legitimacy_level_total': ('counter', 'Scored records by legitimacy level'),
+}
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in sorted(labels.items()))
+    label_text = f'{{{label_text}}}' if label_text else ''
+    return f"{PREFIX}{name}{label_text} {float(value)!r}"
+
+
+def _family(name: str) -> str:
+    # Summary samples (_sum, _count) belong to the family of their base name
+    for suffix in ('_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+class MetricsRegistry:
+    """Thread-safe counters and gauges, plus collectors evaluated at render time."""
+
+    def __init__(self):
+        self._values = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add to a counter or gauge (use a negative value to decrease a gauge)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a function returning (name, labels, value) samples, called on every render."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            samples = [(name, dict(labels), value) for (name, labels), value in self._values.items()]
+            collectors = list(self._collectors)
+        for collector in collectors:
+            samples.extend(collector())
+        return samples
+
+    def render(self) -> str:
+        """All samples in the Prometheus text exposition format."""
+        families = {}
+        for name, labels, value in self.samples():
+            families.setdefault(_family(name), []).append((name, labels, value))
+
+        lines = []
+        for family in sorted(families):
+            metric_type, help_text = METRICS.get(family, ('untyped', family))
+            lines.append(f"# HELP {PREFIX}{family} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{family} {metric_type}")
+            for name, labels, value in sorted(families[family], key=lambda sample: (sample[0], sorted(sample[1].items()))):
+                lines.append(_format_sample(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the metrics to `path` for node_exporter's textfile collector. The file
+        is replaced atomically so the collector never reads a partial file.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+def instrumentation_samples(snapshot: Dict) -> List[Sample]:
+    """
+    Convert an Instrumentation snapshot into samples: one summary per stage, the
+    stage error and byte counts, each counter as `<name>_total`, and records per second.
+    """
+    samples = []
+    for stage, numbers in snapshot['stages'].items():
+        labels = {'stage': stage}
+        for quantile in ('0.5', '0.95', '0.99'):
+            value = numbers[f"p{round(float(quantile) * 100)}_seconds"]
+            if value is not None:
+                samples.append(('stage_duration_seconds', dict(labels, quantile=quantile), value))
+        samples.append(('stage_duration_seconds_sum', labels, numbers['total_seconds']))
+        samples.append(('stage_duration_seconds_count', labels, numbers['calls']))
+        samples.append(('stage_errors_total', labels, numbers['errors']))
+        if numbers['bytes']:
+            samples.append(('stage_received_bytes_total', labels, numbers['bytes']))
+
+    for name, value in snapshot['counters'].items():
+        samples.append((f"{name}_total", {}, value))
+
+    elapsed = snapshot['elapsed_seconds']
+    samples.append(('records_per_second', {}, snapshot['counters'].get('records', 0) / elapsed if elapsed > 0 else 0.0))
+    return samples
+
+
+def cache_samples(cache: str, hits: int, misses: int) -> List[Sample]:
+    """Hit and miss counters and the hit ratio of one cache."""
+    labels = {'cache': cache}
+    samples = [('cache_hits_total', labels, hits), ('cache_misses_total', labels, misses)]
+    if hits + misses:
+        samples.append(('cache_hit_ratio', labels, hits / (hits + misses)))
+    return samples
+
+
+class MetricsServer:
+    """Serves the registry's metrics over HTTP from a background thread."""
+
+    def __init__(self, registry: MetricsRegistry, port: int, address: str = METRICS_BIND_ADDRESS):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would drown out the run's own output
+                pass
+
+        self._server = ThreadingHTTPServer((address, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class TextfileExporter:
+    """Rewrites a textfile-collector file every `interval` seconds and once more on close."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = METRICS_TEXTFILE_INTERVAL):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-textfile', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError as e:
+            print(f"Error writing metrics file: {str(e)}")
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._write()
+
+
+# Shared by the transport and main(), like the instrumentation registry
+metrics = MetricsRegistry()
@@ -0,0 +1,184 @@
+"""
+Incremental writers for the batch outputs. Each writer opens its file on the
+first write, so runs without results do not leave empty files behind. With
+append=True an existing file is continued instead of replaced, which is how
+resumed runs add to the outputs of the interrupted one.
+
+Every writer reports its size() after each record. The checkpoint journal
+stores those sizes with each completed row, and a resumed run cuts the files
+back to them with truncate_output(), which drops anything a killed run wrote
+after its last completed row.
+"""
+
+import csv
+import json
+import os
+import textwrap
+from typing import Dict, Optional
+
+
+def _has_content(path: str) -> bool:
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def _written_size(path: str, opened: bool, append: bool) -> int:
+    # A file that is about to be replaced holds nothing of this run until the first write
+    if (opened or append) and os.path.exists(path):
+        return os.path.getsize(path)
+    return 0
+
+
+def _array_body(content: str, path: str) -> str:
+    """
+    A JSON array up to the end of its last complete element, without the closing
+    bracket. A run killed mid-write leaves no closing bracket and possibly a
+    partial last element; both are cut off.
+
+    Raises:
+        ValueError: If the content is not a JSON array
+    """
+    index = len(content) - len(content.lstrip())
+    if not content.startswith('[', index):
+        raise ValueError(f"Cannot append to {path}: not a JSON array")
+    decoder = json.JSONDecoder()
+    end = index = index + 1
+    while True:
+        index = len(content) - len(content[index:].lstrip())
+        try:
+            _, index = decoder.raw_decode(content, index)
+        except json.JSONDecodeError:
+            return content[:end]
+        end = index
+        index = len(content) - len(content[index:].lstrip())
+        if not content.startswith(',', index):
+            return content[:end]
+        index += 1
+
+
+def truncate_output(path: str, size: int) -> None:
+    """Cut an output file back to `size` bytes, the size recorded after the last completed row."""
+    if not os.path.exists(path):
+        return
+    current = os.path.getsize(path)
+    if current < size:
+        print(f"Warning: {path} is shorter than recorded in the checkpoint journal; some completed rows may be missing")
+    elif current > size:
+        with open(path, 'r+b') as f:
+            f.truncate(size)
+
+
+class JsonArrayWriter:
+    """Streams records into a JSON array, formatted like json.dump(records, indent=4)."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._file = None
+
+    def _open(self) -> None:
+        if self.append and _has_content(self.path):
+            # Reopen the existing array by cutting off its closing bracket, or a
+            # partial last record if the previous run was killed
+            self._file = open(self.path, 'r+', encoding='utf-8')
+            body = _array_body(self._file.read(), self.path)
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(body)
+            if body != '[':
+                self._file.write(',')
+            self._file.write('\n')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write('[\n')
+
+    def write(self, record: Dict) -> None:
+        if self._file is None:
+            self._open()
+        else:
+            self._file.write(',\n')
+        self._file.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), '    '))
+        self._file.flush()
+        self.count += 1
+
+    def size(self) -> int:
+        """Bytes of the file up to the last record, as recorded by the checkpoint journal."""
+        return _written_size(self.path, self._file is not None, self.append)
+
+    def close(self) -> None:
+        if self._file is None and self.append and _has_content(self.path):
+            # Nothing new was written, but truncate_output() may have cut off the closing bracket
+            with open(self.path, 'r+', encoding='utf-8') as f:
+                body = _array_body(f.read(), self.path)
+                f.seek(0)
+                f.truncate()
+                f.write(body + '\n]')
+        if self._file is not None and not self._file.closed:
+            self._file.write('\n]')
+            self._file.close()
+
+
+class CsvRowWriter:
+    """Writes CSV rows as they arrive; the header is taken from the first row."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._file = None
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, row: Dict) -> None:
+        if self._file is None:
+            if self.append and _has_content(self.path):
+                with open(self.path, 'r', newline='', encoding='utf-8') as existing:
+                    fieldnames = next(csv.reader(existing))
+                self._file = open(self.path, 'a', newline='', encoding='utf-8')
+                self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            else:
+                self._file = open(self.path, 'w', newline='', encoding='utf-8')
+                self._writer = csv.DictWriter(self._file, fieldnames=sorted(row.keys()))
+                self._writer.writeheader()
+        self._writer.writerow(row)
+        self._file.flush()
+        self.count += 1
+
+    def size(self) -> int:
+        """Bytes of the file up to the last row, as recorded by the checkpoint journal."""
+        return _written_size(self.path, self._file is not None, self.append)
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+
+class TextBlockWriter:
+    """Appends text blocks separated by a blank line."""
+
+    def __init__(self, path: str, separator: str = "\n\n", append: bool = False):
+        self.path = path
+        self.separator = separator
+        self.append = append
+        self.count = 0
+        self._file = None
+
+    def write(self, text: str) -> None:
+        if self._file is None:
+            if self.append and _has_content(self.path):
+                self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write(self.separator)
+            else:
+                self._file = open(self.path, 'w', encoding='utf-8')
+        else:
+            self._file.write(self.separator)
+        self._file.write(text)
+        self._file.flush()
+        self.count += 1
+
+    def size(self) -> int:
+        """Bytes of the file up to the last block, as recorded by the checkpoint journal."""
+        return _written_size(self.path, self._file is not None, self.append)
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
@@ -0,0 +1,82 @@
+"""
+In-run store of place details and emirate validations shared across companies.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Union
+
+from config.config import PLACE_STORE_MAX_ENTRIES
+from utils.transport import ErrorResult
+
+
+class PlaceStore:
+    """
+    Place details keyed by place_id, and emirate validations keyed by
+    (place_id, emirate), shared during a run. Companies with
+    overlapping search results (e.g. "Emaar" and "Emaar Properties") share one
+    details request and one validation per place; concurrent requests for the
+    same key wait for the first one instead of repeating it (single-flight).
+
+    Failures (ErrorResult) are returned to the caller but not stored, so the
+    next company to need the place tries again. At most `max_entries` results
+    are kept; the least recently used are dropped first, so memory stays
+    bounded on large batches.
+    """
+
+    def __init__(self, max_entries: int = PLACE_STORE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = {'details': 0, 'validation': 0}
+        self.misses = {'details': 0, 'validation': 0}
+        self._values = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                if key in self._values:
+                    self.hits[key[0]] += 1
+                    self._values.move_to_end(key)
+                    return self._values[key]
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._in_flight[key] = event
+                    break
+            # Another company is already fetching this place
+            event.wait()
+
+        try:
+            with self._lock:
+                self.misses[key[0]] += 1
+            value = compute()
+            if not isinstance(value, ErrorResult):
+                with self._lock:
+                    self._values[key] = value
+                    while len(self._values) > self.max_entries:
+                        self._values.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            event.set()
+
+    def details(self, place_id: str, fetch: Callable[[], Union[Dict, ErrorResult, None]]) -> Union[Dict, ErrorResult, None]:
+        """
+        Place details for a place_id, calling `fetch` only if no other company has fetched them.
+
+        The returned dict is shared; copy it before adding per-company fields.
+        """
+        return self._get(('details', place_id), fetch)
+
+    def validation(self, place_id: str, emirate: str,
+                   validate: Callable[[], Union[Dict, ErrorResult]]) -> Union[Dict, ErrorResult]:
+        """Emirate validation of a place, calling `validate` only once per (place_id, emirate)."""
+        # validate_emirate compares emirates case-insensitively, ignoring surrounding whitespace
+        return self._get(('validation', place_id, emirate.strip().lower()), validate)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss counters for 'details' and 'validation'."""
+        with self._lock:
+            return {kind: {'hits': self.hits[kind], 'misses': self.misses[kind]} for kind in self.hits}
@@ -0,0 +1,135 @@
+"""
+Rate limiting primitives shared by the scrapers.
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill continuously at `rate` per second
+    up to `capacity`; acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, sleeping until enough are available.
+
+        Args:
+            tokens (float): Number of tokens to take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.total_wait += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens immediately, going into debt if necessary, and return how long
+        the caller must wait before using them. For callers that cannot block,
+        such as coroutines.
+
+        Args:
+            tokens (float): Number of tokens to take
+
+        Returns:
+            float: Seconds the caller must wait
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            delay = max(0.0, -self._tokens / self.rate)
+            self.total_wait += delay
+            return delay
+
+
+class AdaptivePacer:
+    """
+    Thread-safe adaptive pacing for a single host. Requests are spaced `interval`
+    seconds apart (with jitter), starting at `min_interval`. A throttle signal
+    (429, block page) multiplies the interval by `backoff` up to `max_interval`
+    and pauses the host; every success shrinks it by `recovery` back towards
+    `min_interval`.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0,
+                 recovery: float = 0.9, jitter: float = 0.25):
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.backoff = backoff
+        self.recovery = recovery
+        self.jitter = jitter
+        self.interval = self.min_interval
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserve the next request slot without sleeping. Concurrent callers get
+        consecutive slots.
+
+        Returns:
+            float: Seconds until the reserved slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = slot - now
+            self.total_wait += delay
+            return delay
+
+    def wait(self) -> float:
+        """
+        Reserve the next request slot and sleep until it; only the calling thread blocks.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval * self.recovery)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after the host signalled throttling.
+
+        Args:
+            retry_after (float, optional): Seconds the host asked us to wait
+        """
+        with self._lock:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+            pause = max(self.interval, retry_after or 0.0)
+            self._next = max(self._next, time.monotonic() + pause)
@@ -0,0 +1,462 @@
+"""
+Company name, domain and email similarity.
+
+Patterns are compiled once, normalized names are memoized, and NameMatcher
+normalizes a searched company once so it can be scored against many candidates.
+
+String comparisons go through an interchangeable backend: 'fuzzywuzzy'
+(difflib SequenceMatcher and fuzzywuzzy, the original scores) or 'rapidfuzz'
+(native). Both return the same scores; the RapidFuzz scorers reproduce
+fuzzywuzzy's preprocessing and difflib's greedy matching blocks where they
+differ, and benchmarks/similarity_backends.py checks that they agree.
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+import tldextract
+from fuzzywuzzy import fuzz
+from tldextract.remote import lenient_netloc
+
+try:
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process, utils as rapid_utils
+    from rapidfuzz.distance import (
+        Indel as rapid_indel, LCSseq as rapid_lcs, Levenshtein as rapid_levenshtein,
+        Postfix as rapid_postfix, Prefix as rapid_prefix
+    )
+except ImportError:
+    rapid_fuzz = None
+
+from config.config import SIMILARITY_BACKEND
+
+
+ABBREVIATIONS = {
+    "mgmt": "management",
+    "llc": "",
+    "ltd": "",
+    "co.": "company",
+    "corp": "corporation",
+    "inc": "",
+    "l.l.c":'',
+    "plc": "",
+    "gmbh": "",
+    "pty": "",
+    "pty.": "",
+    "ltd.": "",
+    "llc.": "",
+    "inc.": "",
+    "corp.": "",
+    "&": "and",
+    "fz": "free zone",
+    "fzc": "free zone company",
+}
+
+
+BUSINESS_SUFFIXES = [
+    "llc", "ltd", "inc", "plc", "gmbh", "pty", "corporation", "company",
+    "group", "holdings", "holding", "limited", "incorporated"
+]
+
+_BUSINESS_SUFFIX_SET = frozenset(BUSINESS_SUFFIXES)
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+# Applied one after another, in BUSINESS_SUFFIXES order, like the original per-call re.sub loop
+_DOMAIN_SUFFIX_PATTERNS = [re.compile(f"{suffix}$") for suffix in BUSINESS_SUFFIXES]
+
+# Uses the public suffix list snapshot bundled with tldextract: never downloads
+# the list and never writes a cache directory, so it works on offline machines
+_TLD_EXTRACTOR = tldextract.TLDExtract(cache_dir=None, suffix_list_urls=(), fallback_to_snapshot=True)
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    name = name.lower().strip()
+    name = _PUNCTUATION.sub(' ', name)
+
+
+    name = _WHITESPACE.sub(' ', name)
+
+
+    words = name.split()
+
+
+    words = [word for word in words if word not in _BUSINESS_SUFFIX_SET]
+
+
+    normalized_words = [ABBREVIATIONS.get(word, word) for word in words]
+
+
+    return " ".join(normalized_words).strip()
+
+@lru_cache(maxsize=65536)
+def _registered_domain(host: str) -> str:
+    extracted = _TLD_EXTRACTOR.extract_str(host)
+
+
+    domain = f"{extracted.domain}.{extracted.suffix}"
+
+
+    domain_parts = domain.split('.')
+    if len(domain_parts) > 1:
+        main_domain = domain_parts[0]
+
+        for pattern in _DOMAIN_SUFFIX_PATTERNS:
+            main_domain = pattern.sub("", main_domain)
+        domain = f"{main_domain}.{domain_parts[1]}"
+
+    return domain.lower()
+
+def extract_domain_name(url: str) -> str:
+    """Company part of a website's registered domain, e.g. 'emaar.com' for https://www.emaarllc.com/."""
+    try:
+        # The path and query never change the result, so pages on the same host share one cache entry
+        return _registered_domain(lenient_netloc(url))
+    except Exception:
+        return ""
+
+
+class FuzzywuzzyBackend:
+    """Original scorers: difflib SequenceMatcher and fuzzywuzzy."""
+
+    name = 'fuzzywuzzy'
+
+    def ratio(self, s1: str, s2: str) -> float:
+        """Similarity between 0 and 1."""
+        return SequenceMatcher(None, s1, s2).ratio()
+
+    def ratios(self, query: str, choices: Sequence[str]) -> List[float]:
+        return [self.ratio(query, choice) for choice in choices]
+
+    def ratio_matrix(self, queries: Sequence[str], choices: Sequence[str]) -> List[List[float]]:
+        return [self.ratios(query, choices) for query in queries]
+
+    def token_set_ratio(self, s1: str, s2: str) -> float:
+        return fuzz.token_set_ratio(s1, s2)
+
+    def partial_ratio(self, s1: str, s2: str) -> float:
+        return fuzz.partial_ratio(s1, s2)
+
+
+def _ascii_process(text: str) -> str:
+    # fuzzywuzzy's full_process(force_ascii=True): drop non-ASCII characters, then clean up
+    return rapid_utils.default_process(text.encode('ascii', 'ignore').decode())
+
+
+def _difflib_ratio(a: str, b: str) -> float:
+    """
+    SequenceMatcher(None, a, b).ratio() without building a SequenceMatcher. The
+    junk heuristics are left out, since they never apply to strings shorter than
+    200 characters.
+    """
+    if len(b) >= 200:
+        return SequenceMatcher(None, a, b).ratio()
+
+    b2j = {}
+    for j, char in enumerate(b):
+        b2j.setdefault(char, []).append(j)
+
+    # Same search as SequenceMatcher.find_longest_match and get_matching_blocks
+    matches = 0
+    queue = [(0, len(a), 0, len(b))]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        besti = bestj = bestsize = 0
+        j2len = {}
+        for i in range(alo, ahi):
+            new_j2len = {}
+            for j in b2j.get(a[i], ()):
+                if j < blo:
+                    continue
+                if j >= bhi:
+                    break
+                k = new_j2len[j] = j2len.get(j - 1, 0) + 1
+                if k > bestsize:
+                    besti, bestj, bestsize = i - k + 1, j - k + 1, k
+            j2len = new_j2len
+        if bestsize:
+            matches += bestsize
+            if alo < besti and blo < bestj:
+                queue.append((alo, besti, blo, bestj))
+            if besti + bestsize < ahi and bestj + bestsize < bhi:
+                queue.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+
+    length = len(a) + len(b)
+    return 2.0 * matches / length if length else 1.0
+
+
+class RapidfuzzBackend:
+    """RapidFuzz scorers, adjusted to return the same scores as FuzzywuzzyBackend."""
+
+    name = 'rapidfuzz'
+
+    def __init__(self, workers: int = -1):
+        if rapid_fuzz is None:
+            raise ImportError("The 'rapidfuzz' similarity backend requires rapidfuzz, which is not installed. "
+                              "Install it with: pip install -r requirements-optional.txt")
+        self.workers = workers
+
+    def ratio(self, s1: str, s2: str) -> float:
+        # difflib matches greedily from the longest common substring, so it can count
+        # fewer characters than the longest common subsequence RapidFuzz finds. The two
+        # agree when that subsequence is one contiguous block; for the other pairs
+        # (mostly unrelated names) the difflib count is reproduced
+        blocks = rapid_indel.opcodes(s1, s2).as_matching_blocks()
+        if len(blocks) > 2:
+            return _difflib_ratio(s1, s2)
+        length = len(s1) + len(s2)
+        return 2.0 * blocks[0].size / length if length else 1.0
+
+    def ratios(self, query: str, choices: Sequence[str]) -> List[float]:
+        # A single row is too small to be worth spreading over threads
+        return self._ratio_matrix([query], choices, workers=1)[0]
+
+    def ratio_matrix(self, queries: Sequence[str], choices: Sequence[str]) -> List[List[float]]:
+        return self._ratio_matrix(queries, choices, workers=self.workers)
+
+    def _ratio_matrix(self, queries: Sequence[str], choices: Sequence[str], workers: int) -> List[List[float]]:
+        if not queries or not choices:
+            return [[] for _ in queries]
+
+        # Name parts repeat across candidates (e.g. an empty secondary part), so each is scored once
+        unique = list(dict.fromkeys(choices))
+        common = rapid_process.cdist(queries, unique, scorer=rapid_lcs.similarity, workers=workers)
+        prefix = rapid_process.cdist(queries, unique, scorer=rapid_prefix.similarity, workers=workers)
+        postfix = rapid_process.cdist(queries, unique, scorer=rapid_postfix.similarity, workers=workers)
+
+        lengths = np.add.outer([len(query) for query in queries], [len(choice) for choice in unique])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(lengths > 0, 2.0 * common / lengths, 1.0)
+
+        # The subsequence is known to be contiguous when it is at most one character, or
+        # when the common prefix or suffix alone is as long; only the other pairs need
+        # the difflib count, which runs in Python
+        uncertain = (common > 1) & (prefix < common) & (postfix < common)
+        for i, j in zip(*np.nonzero(uncertain)):
+            scores[i, j] = _difflib_ratio(queries[i], unique[j])
+
+        columns = {choice: index for index, choice in enumerate(unique)}
+        order = [columns[choice] for choice in choices]
+        return scores[:, order].tolist()
+
+    def token_set_ratio(self, s1: str, s2: str) -> float:
+        return round(rapid_fuzz.token_set_ratio(s1, s2, processor=_ascii_process))
+
+    def partial_ratio(self, s1: str, s2: str) -> float:
+        # fuzzywuzzy only tries the windows that line up with a matching block of the
+        # Levenshtein alignment; rapidfuzz.fuzz.partial_ratio searches every window
+        # and often scores higher, so the alignment is reproduced here
+        if s1 == s2:
+            return 100
+        if not s1 or not s2:
+            return 0
+
+        shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+        best = 0.0
+        for block in rapid_levenshtein.opcodes(shorter, longer).as_matching_blocks():
+            long_start = max(block.b - block.a, 0)
+            similarity = rapid_fuzz.ratio(shorter, longer[long_start:long_start + len(shorter)]) / 100
+            if similarity > .995:
+                return 100
+            best = max(best, similarity)
+        return round(100 * best)
+
+
+SIMILARITY_BACKENDS = {
+    'fuzzywuzzy': FuzzywuzzyBackend,
+    'rapidfuzz': RapidfuzzBackend
+}
+
+_backend = None
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the string-matching backend for this process.
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If the backend's dependency is not installed
+    """
+    global _backend
+    if name not in SIMILARITY_BACKENDS:
+        raise ValueError(f"Unknown similarity backend '{name}'. Choose from: {', '.join(SIMILARITY_BACKENDS)}")
+    _backend = SIMILARITY_BACKENDS[name]()
+
+
+def get_backend():
+    if _backend is None:
+        try:
+            set_backend(SIMILARITY_BACKEND)
+        except (ValueError, ImportError) as e:
+            raise type(e)(f"SIMILARITY_BACKEND = '{SIMILARITY_BACKEND}' in config/config.py: {e}") from e
+    return _backend
+
+
+class NameMatcher:
+    """
+    Similarity scorer for one searched company name. The name is normalized and
+    split once; each candidate only pays for its own normalization (memoized)
+    and the comparison itself.
+    """
+
+    def __init__(self, company_name: str):
+        self.company_name = company_name
+        self.normalized = normalize_name(company_name)
+        words = self.normalized.split()
+        self.words = words
+        self.primary = " ".join(words[:2])
+        self.secondary = " ".join(words[2:])
+
+    def name_similarity(self, candidate_name: str, weight_primary: float = 0.6, weight_secondary: float = 0.4) -> float:
+        """Weighted similarity (0-1) of the first two words and of the remaining words."""
+        words = normalize_name(candidate_name).split()
+
+        if not self.words or not words:
+            return 0.0
+
+
+        backend = get_backend()
+        primary_sim = backend.ratio(self.primary, " ".join(words[:2]))
+        secondary_sim = backend.ratio(self.secondary, " ".join(words[2:]))
+
+
+        return (primary_sim * weight_primary) + (secondary_sim * weight_secondary)
+
+    def is_confident_match(self, candidate_name: str, threshold: float) -> bool:
+        """
+        Whether a candidate is surely the searched company: it contains every word of
+        the searched name ("Emaar Properties PJSC" for "Emaar Properties"), or it
+        starts with the same word and reaches `threshold` name similarity. Similarity
+        alone is not enough, since a shared generic word scores high ("Life Pharmacy"
+        is 0.91 similar to "Gulf Pharmacy").
+        """
+        words = normalize_name(candidate_name).split()
+        if not self.words or not words:
+            return False
+        if set(self.words) <= set(words):
+            return True
+        return words[0] == self.words[0] and self.name_similarity(candidate_name) >= threshold
+
+    def name_similarities(self, candidate_names: Sequence[str], weight_primary: float = 0.6,
+                          weight_secondary: float = 0.4) -> List[float]:
+        """name_similarity() for many candidates, scored in one backend call per name part."""
+        split_names = [normalize_name(name).split() for name in candidate_names]
+        if not self.words:
+            return [0.0] * len(split_names)
+
+        backend = get_backend()
+        primary_sims = backend.ratios(self.primary, [" ".join(words[:2]) for words in split_names])
+        secondary_sims = backend.ratios(self.secondary, [" ".join(words[2:]) for words in split_names])
+
+        return [
+            (primary_sim * weight_primary) + (secondary_sim * weight_secondary) if words else 0.0
+            for words, primary_sim, secondary_sim in zip(split_names, primary_sims, secondary_sims)
+        ]
+
+    def domain_similarity(self, domain: str) -> float:
+        """Similarity (0-100) between the company name and a website domain."""
+        normalized_company = self.normalized
+        normalized_domain = normalize_name(domain)
+
+
+        domain_parts = normalized_domain.split('.')
+
+
+        if len(domain_parts) >= 2:
+            second_level_domain = domain_parts[-2]
+        else:
+            second_level_domain = domain_parts[0]
+
+
+
+        backend = get_backend()
+        second_level_similarity = backend.token_set_ratio(normalized_company, second_level_domain)
+
+
+        full_domain_similarity = backend.token_set_ratio(normalized_company, normalized_domain)
+
+
+        second_level_partial = backend.partial_ratio(normalized_company, second_level_domain)
+        full_domain_partial = backend.partial_ratio(normalized_company, normalized_domain)
+
+
+        weighted_score = (
+            (second_level_similarity * 0.5) +
+            (second_level_partial * 0.2) +
+            (full_domain_similarity * 0.2) +
+            (full_domain_partial * 0.1)
+        )
+
+
+        if weighted_score > 0:
+
+            if second_level_partial > 30 or full_domain_partial > 30:
+
+                weighted_score = max(weighted_score, 60)
+
+
+                if second_level_partial > 50 or full_domain_partial > 50:
+                    weighted_score = min(weighted_score * 1.5, 95)
+
+        return weighted_score
+
+
+@lru_cache(maxsize=1024)
+def get_matcher(company_name: str) -> NameMatcher:
+    """Shared NameMatcher for a company name, so every scoring stage reuses one instance."""
+    return NameMatcher(company_name)
+
+def calculate_domain_similarity(company_name: str, domain: str) -> float:
+    return get_matcher(company_name).domain_similarity(domain)
+
+def calculate_name_similarity(name1: str, name2: str, weight_primary: float = 0.6, weight_secondary: float = 0.4) -> float:
+    return get_matcher(name1).name_similarity(name2, weight_primary, weight_secondary)
+
+def name_similarity_matrix(company_names: Sequence[str], candidate_names: Sequence[str],
+                           weight_primary: float = 0.6, weight_secondary: float = 0.4) -> List[List[float]]:
+    """
+    calculate_name_similarity() for every pair of company names (rows) and
+    candidate names (columns), in one backend call per name part.
+    """
+    queries = [get_matcher(name) for name in company_names]
+    split_names = [normalize_name(name).split() for name in candidate_names]
+
+    backend = get_backend()
+    primary_sims = backend.ratio_matrix([matcher.primary for matcher in queries],
+                                        [" ".join(words[:2]) for words in split_names])
+    secondary_sims = backend.ratio_matrix([matcher.secondary for matcher in queries],
+                                          [" ".join(words[2:]) for words in split_names])
+
+    return [
+        [
+            (primary_sim * weight_primary) + (secondary_sim * weight_secondary) if matcher.words and words else 0.0
+            for words, primary_sim, secondary_sim in zip(split_names, primary_row, secondary_row)
+        ]
+        for matcher, primary_row, secondary_row in zip(queries, primary_sims, secondary_sims)
+    ]
+
+def calculate_email_similarity(email1: str, email2: str) -> float:
+
+    email1 = email1.lower().strip()
+    email2 = email2.lower().strip()
+
+
+    try:
+        local1, domain1 = email1.split('@')
+        local2, domain2 = email2.split('@')
+    except ValueError:
+        return 0.0
+
+
+    local_similarity = SequenceMatcher(None, local1, local2).ratio()
+    domain_similarity = SequenceMatcher(None, domain1, domain2).ratio()
+
+
+    weighted_similarity = (local_similarity * 0.7) + (domain_similarity * 0.3)
+
+    return weighted_similarity * 100
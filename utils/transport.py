@@ -0,0 +1,382 @@
+"""
+Shared transport layer for provider calls: per-host rate limiting or adaptive
+pacing, retries with exponential backoff and jitter, Retry-After handling and a
+circuit breaker.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import googlemaps
+import requests
+from geopy import exc as geopy_exc
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from config.config import (
+    RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, HOST_RATE_LIMITS,
+    HOST_PACING, PACING_BACKOFF, PACING_RECOVERY
+)
+from utils.concurrency import backend_limiter
+from utils.metrics import metrics
+from utils.rate_limit import AdaptivePacer, TokenBucket
+
+
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_API_STATUSES = {'OVER_QUERY_LIMIT', 'UNKNOWN_ERROR'}
+THROTTLE_STATUSES = {429, 'OVER_QUERY_LIMIT', 'blocked'}
+
+
+class TransportError(Exception):
+    """A provider call failed after retries, or could not be attempted."""
+
+    def __init__(self, host: str, message: str, status: Any = None, retryable: bool = False,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.host = host
+        self.message = message
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    def __str__(self):
+        status = f" [{self.status}]" if self.status is not None else ""
+        return f"{self.host}{status}: {self.message}"
+
+
+class CircuitOpenError(TransportError):
+    """
+    The host's circuit breaker is open; the call was not attempted. Retryable,
+    since the same call can succeed once the breaker has cooled down.
+    """
+
+
+class ErrorResult:
+    """
+    Returned by the scrapers in place of data when a provider call failed, so a
+    failure is not mistaken for "no results". It is falsy and iterates as empty,
+    which keeps existing `if results:` / `for x in results:` callers working.
+    """
+
+    def __init__(self, error: TransportError):
+        self.error = error
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __repr__(self) -> str:
+        return f"ErrorResult({self.error})"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(host: str, error: Exception) -> TransportError:
+    """Map a provider library exception to a TransportError."""
+    if isinstance(error, TransportError):
+        return error
+    if isinstance(error, googlemaps.exceptions.TransportError) and error.base_exception is not None:
+        # googlemaps.Client wraps whatever its session raised, including our response hook's HTTPError
+        error = error.base_exception
+
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return TransportError(host, str(error), status=status, retryable=status in RETRYABLE_HTTP_STATUSES,
+                              retry_after=parse_retry_after(error.response.headers.get('Retry-After')))
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return TransportError(host, str(error), retryable=True)
+
+    if httpx is not None:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return TransportError(host, str(error), status=status, retryable=status in RETRYABLE_HTTP_STATUSES,
+                                  retry_after=parse_retry_after(error.response.headers.get('Retry-After')))
+        if isinstance(error, httpx.TransportError):
+            return TransportError(host, str(error) or type(error).__name__, retryable=True)
+
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return TransportError(host, str(error), status=error.status, retryable=error.status in RETRYABLE_API_STATUSES)
+    if isinstance(error, googlemaps.exceptions.HTTPError):
+        return TransportError(host, str(error), status=error.status_code,
+                              retryable=error.status_code in RETRYABLE_HTTP_STATUSES)
+    if isinstance(error, (googlemaps.exceptions.Timeout, googlemaps.exceptions.TransportError)):
+        return TransportError(host, str(error) or 'Request timed out', retryable=True)
+
+    if isinstance(error, geopy_exc.GeocoderRateLimited):
+        return TransportError(host, str(error), status=429, retryable=True, retry_after=error.retry_after)
+    if isinstance(error, (geopy_exc.GeocoderTimedOut, geopy_exc.GeocoderUnavailable)):
+        return TransportError(host, str(error), retryable=True)
+    if isinstance(error, geopy_exc.GeopyError):
+        return TransportError(host, str(error))
+
+    return TransportError(host, f"{type(error).__name__}: {error}")
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and half-opens after a cool-down."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """Whether a request may go out; a half-open circuit lets a single trial request through."""
+        with self._lock:
+            state = self._state()
+            if state == 'half-open':
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+                return True
+            return state == 'closed'
+
+    def release_trial(self) -> None:
+        """Let another trial through after one ended without a success or failure to record."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold:
+                # Also restarts the cool-down when a half-open trial request fails
+                self.opened_at = time.monotonic()
+
+
+@contextmanager
+def _in_flight(host: str) -> Iterator[None]:
+    metrics.inc('in_flight_requests', provider=host)
+    try:
+        yield
+    finally:
+        metrics.inc('in_flight_requests', -1, provider=host)
+
+
+def _count_request(host: str, error: Optional[TransportError] = None) -> None:
+    status = 'ok' if error is None else str(error.status) if error.status is not None else 'error'
+    metrics.inc('requests_total', provider=host, status=status)
+
+
+class Transport:
+    """
+    Executes provider calls with per-host rate limits, retries and circuit breakers.
+    Hosts listed in `pacing` are spaced by an AdaptivePacer instead of a fixed rate.
+    One instance is shared by every scraper so limits apply across all workers.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None, max_attempts: int = RETRY_MAX_ATTEMPTS,
+                 base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY,
+                 pacing: Optional[Dict[str, Dict]] = None):
+        self.rate_limits = dict(HOST_RATE_LIMITS, **(rate_limits or {}))
+        self.pacing = dict(HOST_PACING, **(pacing or {}))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters = {}
+        self._pacers = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> Optional[TokenBucket]:
+        with self._lock:
+            if host not in self._limiters:
+                rate = self.rate_limits.get(host)
+                self._limiters[host] = TokenBucket(rate) if rate else None
+            return self._limiters[host]
+
+    def pacer(self, host: str) -> Optional[AdaptivePacer]:
+        with self._lock:
+            if host not in self._pacers:
+                settings = self.pacing.get(host)
+                self._pacers[host] = AdaptivePacer(backoff=PACING_BACKOFF, recovery=PACING_RECOVERY,
+                                                   **settings) if settings else None
+            return self._pacers[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _after_failure(self, error: TransportError, cause: Exception, attempt: int, breaker: CircuitBreaker,
+                       pacer: Optional[AdaptivePacer]) -> float:
+        """Record a failed attempt and return the delay before the next one, or raise if there is none."""
+        throttled = pacer is not None and error.status in THROTTLE_STATUSES
+        if throttled:
+            pacer.record_throttle(error.retry_after)
+        if not error.retryable:
+            breaker.release_trial()
+            raise error from cause
+
+        breaker.record_failure()
+        if attempt == self.max_attempts - 1:
+            raise error from cause
+
+        if throttled:
+            # The pacer has already pushed this host's next slot back
+            return 0.0
+        delay = error.retry_after if error.retry_after is not None else self.backoff(attempt)
+        return min(delay, self.max_delay)
+
+    def call(self, host: str, fn: Callable, *args, backend: Optional[str] = None, **kwargs) -> Any:
+        """
+        Call `fn(*args, **kwargs)` against `host`.
+
+        Args:
+            host (str): Host the call goes to; selects the rate limiter and circuit breaker
+            fn (Callable): Function performing the request
+            backend (str, optional): Backend concurrency slot to hold during each attempt
+
+        Returns:
+            Any: Whatever fn returns
+
+        Raises:
+            TransportError: When the call failed permanently, retries ran out, or the circuit is open
+        """
+        breaker = self.breaker(host)
+        limiter = self.limiter(host)
+        pacer = self.pacer(host)
+
+        for attempt in range(self.max_attempts):
+            if not breaker.allow():
+                metrics.inc('circuit_open_total', provider=host)
+                raise CircuitOpenError(host, 'Circuit open after repeated failures; not calling provider',
+                                       retryable=True)
+
+            # Waiting happens before the backend slot is taken, so only this thread blocks
+            if pacer:
+                metrics.inc('rate_limit_wait_seconds_total', pacer.wait(), provider=host)
+            elif limiter:
+                metrics.inc('rate_limit_wait_seconds_total', limiter.acquire(), provider=host)
+            try:
+                if backend:
+                    with backend_limiter.slot(backend), _in_flight(host):
+                        result = fn(*args, **kwargs)
+                else:
+                    with _in_flight(host):
+                        result = fn(*args, **kwargs)
+            except Exception as e:
+                error = classify_error(host, e)
+                _count_request(host, error)
+                delay = self._after_failure(error, e, attempt, breaker, pacer)
+                if delay:
+                    time.sleep(delay)
+                continue
+            except BaseException:
+                # Interrupted or cancelled mid-call: the outcome is unknown, so free the half-open trial
+                breaker.release_trial()
+                raise
+
+            _count_request(host)
+            breaker.record_success()
+            if pacer:
+                pacer.record_success()
+            return result
+
+    async def call_async(self, host: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Coroutine version of call(): awaits `fn(*args, **kwargs)` with the same rate
+        limits, pacing, retries and circuit breaker, sleeping without blocking the
+        event loop. Concurrency is left to the caller.
+
+        Args:
+            host (str): Host the call goes to; selects the rate limiter and circuit breaker
+            fn (Callable): Coroutine function performing the request
+
+        Returns:
+            Any: Whatever fn returns
+
+        Raises:
+            TransportError: When the call failed permanently, retries ran out, or the circuit is open
+        """
+        breaker = self.breaker(host)
+        limiter = self.limiter(host)
+        pacer = self.pacer(host)
+
+        for attempt in range(self.max_attempts):
+            if not breaker.allow():
+                metrics.inc('circuit_open_total', provider=host)
+                raise CircuitOpenError(host, 'Circuit open after repeated failures; not calling provider',
+                                       retryable=True)
+
+            wait = pacer.reserve() if pacer else limiter.reserve() if limiter else 0.0
+            if wait:
+                metrics.inc('rate_limit_wait_seconds_total', wait, provider=host)
+                await asyncio.sleep(wait)
+            try:
+                with _in_flight(host):
+                    result = await fn(*args, **kwargs)
+            except Exception as e:
+                error = classify_error(host, e)
+                _count_request(host, error)
+                delay = self._after_failure(error, e, attempt, breaker, pacer)
+                if delay:
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Interrupted or cancelled mid-call: the outcome is unknown, so free the half-open trial
+                breaker.release_trial()
+                raise
+
+            _count_request(host)
+            breaker.record_success()
+            if pacer:
+                pacer.record_success()
+            return result
+
+
+default_transport = Transport()